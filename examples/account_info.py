@@ -9,76 +9,64 @@ Demonstrates:
 """
 
 import asyncio
-from ezib_async import ezIBAsync
+from ezib_async import session, run
 
 
 async def main():
-    # Initialize ezIBAsync client
-    ezib = ezIBAsync()
-    
-    try:
-        # Connect to IB Gateway/TWS
-        await ezib.connectAsync(ibhost='127.0.0.1', ibport=4001, ibclient=100)
+    # Connect to IB Gateway/TWS; disconnects when the block exits
+    async with session(ibhost='127.0.0.1', ibport=4001, ibclient=100) as ezib:
+        print("Connected! Waiting for account data...")
+        try:
+            await asyncio.wait_for(ezib.account_ready.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            print("No account data received within 5 seconds")
         
-        if not ezib.connected:
-            print("Failed to connect to IB")
-            return
-            
-        print("Connected! Waiting for account data (5 seconds)...")
-        await asyncio.sleep(5)
+        # Read each property once; account and portfolio are looked up on every access
+        snap = {
+            name: getattr(ezib, name)
+            for name in ('account', 'positions', 'portfolio', 'contracts', 'orders', 'symbol_orders')
+        }
         
         # Account Information
         print("\nAccount Information")
-        print(ezib.account)
+        print(snap['account'])
         
         # Positions 
         print("\nPositions")
-        print(ezib.positions)
+        print(snap['positions'])
         
         # Portfolio
         print("\nPortfolio")
-        print(ezib.portfolio)
+        print(snap['portfolio'])
         
         # Contracts
         print("\nContracts")
-        print(ezib.contracts)
+        print(snap['contracts'])
         
         # Orders by TickId
         print("\nOrders (by TickId)")
-        print(ezib.orders)
+        print(snap['orders'])
         
         # Orders by Symbol
         print("\nOrders (by Symbol)")
-        print(ezib.symbol_orders)
+        print(snap['symbol_orders'])
         
         # Summary
         print(f"\n{'='*50}")
         print("SUMMARY")
         print(f"{'='*50}")
-        properties = [
-            ('account', ezib.account),
-            ('positions', ezib.positions),
-            ('portfolio', ezib.portfolio), 
-            ('contracts', ezib.contracts),
-            ('orders', ezib.orders),
-            ('symbol_orders', ezib.symbol_orders)
-        ]
-        
-        for prop_name, prop_value in properties:
-            count = len(prop_value) if prop_value else 0
-            status = "✓" if prop_value else "✗"
-            print(f"  ezib.{prop_name:<12}: {status} ({count} items)")
+        lines = []
+        for prop_name, prop_value in snap.items():
+            count = len(prop_value or ())
+            status = "✓" if count else "✗"
+            lines.append(f"  ezib.{prop_name:<12}: {status} ({count} items)")
+        print("\n".join(lines))
             
         print("\nNote: All properties auto-update after connection")
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        
-    finally:
-        if ezib.connected:
-            ezib.disconnect()
-            print("Disconnected")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        run(main())
+    except ConnectionError as e:
+        print(f"Failed to connect: {e}")
\ No newline at end of file
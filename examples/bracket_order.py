@@ -12,7 +12,7 @@ WARNING: This places real orders! Use paper trading account.
 """
 
 import asyncio
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, run
 
 
 async def main():
@@ -30,25 +30,22 @@ async def main():
             
         print("Connected! Creating contract...")
         
-        # Create contract and get market data
+        # Create contract and take a one-off quote; no streaming feed needed
         contract = await ezib.createStockContract("AAPL")
-        await ezib.requestMarketData([contract])
-        await asyncio.sleep(3)
+        quote = (await ezib.snapshot(contract)).get(ezib.contractString(contract), {})
         
-        # Get current price from market data
-        ticker_id = ezib.tickerId(contract)
-        market_data = ezib.marketData.get(ticker_id, {})
-        current_price = market_data.get('last', [None])[-1] or market_data.get('ask', [None])[-1]
+        last, ask = quote.get("last", 0), quote.get("ask", 0)
+        current_price = last if last > 0 else ask  # last is NaN before the first trade
         
-        if current_price:
+        if current_price and current_price > 0:
             print(f"Current AAPL price: ${current_price}")
         else:
             print("Could not get current price")
             return
         
         # Calculate bracket levels
-        target_price = round(current_price * 1.02, 2)  # +2%
-        stop_price = round(current_price * 0.99, 2)    # -1%
+        target_price = ezib.offsetPrice(current_price, 200)  # +2%
+        stop_price = ezib.offsetPrice(current_price, -100)   # -1%
         
         print(f"\nBracket Order Setup (Extended Hours):")
         print(f"  Entry: Market Order")
@@ -72,18 +69,22 @@ async def main():
         print(f"  Stop Order ID: {bracket_result['stopOrderId']}")
         print(f"  OCA Group: {bracket_result['group']}")
         
-        # Monitor orders briefly
-        await asyncio.sleep(5)
+        # Wait for the entry to fill instead of polling its status
+        entry_trade = ezib.orders[bracket_result['entryOrderId']]['trade']
+        try:
+            await asyncio.wait_for(entry_trade.filledEvent, timeout=30)
+            print("Entry order filled, target and stop are now working")
+        except asyncio.TimeoutError:
+            print(f"Entry order not filled within 30 seconds ({entry_trade.orderStatus.status})")
+        
         print(f"\n=== ORDER STATUS ===")
         if ezib.orders:
             for order_info in ezib.orders.values():
-                print(f"Order {order_info['id']}: {order_info['status']} - {order_info['symbol']}")
+                order_id, status, symbol = order_info['id'], order_info['status'], order_info['symbol']
+                print(f"Order {order_id}: {status} - {symbol}")
         else:
             print("No active orders found")
         
-        # Cancel market data subscription
-        ezib.cancelMarketData([contract])
-        
     except Exception as e:
         print(f"Error: {e}")
         
@@ -96,4 +97,4 @@ async def main():
 if __name__ == "__main__":
     print("WARNING: This example places real bracket orders!")
     print("Uncomment the line below to run:")
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
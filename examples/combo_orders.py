@@ -12,7 +12,7 @@ Requires options trading permissions and market data.
 """
 
 import asyncio
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, run
 
 
 async def main():
@@ -35,8 +35,10 @@ async def main():
         expiry = "20251219"
         
         # Bull Call Spread: Buy lower strike, Sell higher strike
-        buy_call = await ezib.createOptionContract(symbol, expiry=expiry, strike=200.0, otype="C")
-        sell_call = await ezib.createOptionContract(symbol, expiry=expiry, strike=210.0, otype="C")
+        buy_call, sell_call = await asyncio.gather(
+            ezib.createOptionContract(symbol, expiry=expiry, strike=200.0, otype="C"),
+            ezib.createOptionContract(symbol, expiry=expiry, strike=210.0, otype="C")
+        )
         
         print(f"Created options: {buy_call.symbol}, {sell_call.symbol}")
         
@@ -48,9 +50,11 @@ async def main():
         # Display option prices
         print(f"\n=== OPTION PRICES ===")
         for contract in contracts:
-            if contract.symbol in ezib.marketData:
-                data = ezib.marketData[contract.symbol]
-                print(f"{contract.strike}C: Bid={data.get('bid')} Ask={data.get('ask')}")
+            ticker_id = ezib.tickerId(contract)
+            data = ezib.optionsData.get(ticker_id)
+            if data is not None:
+                latest = data.latest()
+                print(f"{contract.strike}C: Bid={latest.bid} Ask={latest.ask}")
         
         # Check if combo methods exist
         if hasattr(ezib, 'createComboContract') and hasattr(ezib, 'createComboLeg'):
@@ -106,4 +110,4 @@ if __name__ == "__main__":
     print("WARNING: This example places real combo/spread orders!")
     print("Requires options permissions and market data subscriptions.")
     print("Uncomment the line below to run:")
-    # asyncio.run(main())
\ No newline at end of file
+    # run(main())
\ No newline at end of file
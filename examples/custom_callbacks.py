@@ -8,11 +8,24 @@ Demonstrates:
 - Handling market data updates
 - Price alerts and trading logic
 
+Ticker updates are logged as JSON lines. Install ``orjson`` to serialize
+them several times faster; the stdlib ``json`` module is used otherwise.
+
 WARNING: This places a test order for callback testing!
 """
 
+import json
+import time
 import asyncio
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, run
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# built once; order status events can arrive many times a second during fills
+ORDER_STATUS_FMT = "📊 Order {id}: {status} (Filled: {filled})".format_map
 
 
 class SimpleBot:
@@ -22,47 +35,72 @@ class SimpleBot:
         self.ezib = ezib
         self.filled_orders = []
         
+        # ticker lines are printed by a background task, not in the callback
+        self.log_q = asyncio.Queue(maxsize=1024)
+        self.log_task = None
+        if orjson is not None:
+            self._dumps = lambda obj: orjson.dumps(obj).decode()
+        else:
+            self._dumps = json.dumps
+        
+        # price alerts by ticker id -> (threshold, symbol)
+        self._alerts = {}
+        
     def setup_events(self):
         """Set up event handlers using ib_async."""
-        try:
-            ib = self.ezib.ib
-            
-            # Order status events
-            if hasattr(ib, 'orderStatusEvent'):
-                ib.orderStatusEvent += self.on_order_status
-                print("Connected to order status events")
-                
-            # Ticker events
-            if hasattr(ib, 'pendingTickersEvent'):
-                ib.pendingTickersEvent += self.on_ticker_update
-                print("Connected to ticker events")
-                
-        except Exception as e:
-            print(f"Error setting up events: {e}")
+        missing = self.ezib.registerHandlers({
+            "orderStatusEvent": [self.on_order_status],
+            "pendingTickersEvent": [self.on_ticker_update],
+        })
+        if not missing:
+            print("Connected to order status and ticker events")
     
     def on_order_status(self, trade):
         """Handle order status changes."""
         order_id = trade.order.orderId
         status = trade.orderStatus.status
-        filled = trade.orderStatus.filled
         
-        print(f"📊 Order {order_id}: {status} (Filled: {filled})")
+        print(ORDER_STATUS_FMT(
+            {"id": order_id, "status": status, "filled": trade.orderStatus.filled}
+        ))
         
         if status == "Filled" and order_id not in self.filled_orders:
             self.filled_orders.append(order_id)
             print(f"🎯 ORDER FILLED! Order ID: {order_id}")
     
+    def start_logging(self):
+        """Start the background task that prints queued ticker lines."""
+        self.log_task = asyncio.create_task(self._log_writer())
+        
+    async def _log_writer(self):
+        """Write queued ticker JSON lines to stdout in batches of up to 64."""
+        while True:
+            batch = [await self.log_q.get()]
+            while len(batch) < 64 and not self.log_q.empty():
+                batch.append(self.log_q.get_nowait())
+            print("\n".join(batch), flush=True)
+    
+    def add_alert(self, contract, above):
+        """Alert when the contract's last price trades above a threshold."""
+        self._alerts[self.ezib.tickerId(contract)] = (above, contract.symbol)
+    
     def on_ticker_update(self, tickers):
         """Handle market data updates."""
+        alerts = self._alerts
         for ticker in tickers:
-            if ticker.last and ticker.last > 0:
-                symbol = ticker.contract.symbol
-                price = ticker.last
-                print(f"📈 {symbol}: ${price}")
-                
-                # Example price alert
-                if symbol == "AAPL" and price > 200:
-                    print(f"🔔 PRICE ALERT: {symbol} above $200!")
+            last = ticker.last
+            if not (last and last > 0):  # no trade yet: None, 0 or NaN
+                continue
+            
+            record = {"s": ticker.contract.symbol, "p": last, "t": time.time_ns()}
+            try:
+                self.log_q.put_nowait(self._dumps(record))
+            except asyncio.QueueFull:
+                pass  # drop the line rather than stall the event loop
+            
+            alert = alerts.get(self.ezib.tickerId(ticker.contract)) if alerts else None
+            if alert is not None and last > alert[0]:
+                print(f"🔔 PRICE ALERT: {alert[1]} above ${alert[0]:g}!")
 
 
 async def main():
@@ -83,20 +121,31 @@ async def main():
         # Create trading bot
         bot = SimpleBot(ezib)
         bot.setup_events()
+        bot.start_logging()
         
         # Create contract and request market data
         contract = await ezib.createStockContract("AAPL")
-        await ezib.requestMarketData([contract])
+        bot.add_alert(contract, above=200)
+        ready = await ezib.requestMarketData([contract])
+        ticker_id = ezib.tickerId(contract)
         
         # Place a test limit order (unlikely to fill immediately)
         current_price = None
-        await asyncio.sleep(3)
+        event = ready.get(ticker_id)
+        if event is None:
+            print("Market data request failed")
+        else:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=3)
+            except asyncio.TimeoutError:
+                print("No market data received within 3 seconds")
         
-        if contract.symbol in ezib.marketData:
-            data = ezib.marketData[contract.symbol]
-            current_price = data.get('last') or data.get('bid')
+        data = ezib.marketData.get(ticker_id)
+        if data is not None:
+            latest = data.latest()
+            current_price = latest.last if latest.last > 0 else latest.bid
             
-        if current_price:
+        if current_price and current_price > 0:
             limit_price = round(current_price * 0.95, 2)  # Well below market
             print(f"Placing test limit order at ${limit_price}")
             
@@ -110,6 +159,8 @@ async def main():
         print("Monitoring events for 30 seconds...")
         await asyncio.sleep(30)
         
+        bot.log_task.cancel()
+        
         print(f"\n=== SUMMARY ===")
         print(f"Filled orders: {bot.filled_orders}")
         print("Event monitoring completed")
@@ -128,4 +179,4 @@ async def main():
 if __name__ == "__main__":
     print("WARNING: This example places a test order for callback demonstration!")
     print("Uncomment the line below to run:")
-    # asyncio.run(main())
\ No newline at end of file
+    # run(main())
\ No newline at end of file
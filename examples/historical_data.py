@@ -3,8 +3,8 @@
 Historical data request example for ezib_async.
 """
 
-import asyncio
-from ezib_async import ezIBAsync
+import math
+from ezib_async import ezIBAsync, run
 
 
 async def main():
@@ -46,13 +46,16 @@ async def main():
             for bar in bars[-5:]:
                 print(f"  {bar.date}: Close=${bar.close:.2f} Volume={bar.volume:,}")
             
-            # Show data summary
-            from ib_async import util
-            df = util.df(bars)
+            # Show data summary, computed in a single pass over the bars
+            low, high, volume = math.inf, -math.inf, 0
+            for bar in bars:
+                low = min(low, bar.low)
+                high = max(high, bar.high)
+                volume += bar.volume
             print("\nData Summary:")
-            print(f"  Date range: {df['date'].min()} to {df['date'].max()}")
-            print(f"  Price range: ${df['low'].min():.2f} - ${df['high'].max():.2f}")
-            print(f"  Total volume: {df['volume'].sum():,}")
+            print(f"  Date range: {bars[0].date} to {bars[-1].date}")
+            print(f"  Price range: ${low:.2f} - ${high:.2f}")
+            print(f"  Total volume: {volume:,}")
         else:
             print("No data received")
     
@@ -67,4 +70,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -9,41 +9,50 @@ Demonstrates:
 """
 
 import asyncio
-from ezib_async import ezIBAsync
+from contextlib import AsyncExitStack
+from ezib_async import session, run
 
 
 async def main():
     """Market data request example."""
-    ezib = ezIBAsync()
-    
-    try:
-        # Connect to IB
-        print("Connecting to IB...")
-        await ezib.connectAsync(ibhost='127.0.0.1', ibport=4001, ibclient=0)
-        
-        if not ezib.connected:
-            print("Failed to connect")
-            return
-            
+    # Disconnects and cancels every subscription on exit, even on early return
+    async with session(ibhost='127.0.0.1', ibport=4001, ibclient=0) as ezib, AsyncExitStack() as subscriptions:
         print("Connected! Creating contracts...")
         
-        # Create contracts
-        contracts = await asyncio.gather(
+        # Create contracts concurrently and subscribe to each one as soon as
+        # it is qualified, instead of waiting for the slowest
+        contracts = []
+        ready = {}
+        for created in asyncio.as_completed([
             ezib.createStockContract("AAPL"),
             ezib.createFuturesContract("ES", expiry="202512"),
             ezib.createForexContract("EUR", currency="USD"),
             ezib.createOptionContract("AAPL", expiry="20251219", strike=200, otype="C")
-        )
+        ]):
+            try:
+                contract = await created
+            except Exception as e:
+                print(f"Error creating contract: {e}")
+                continue
+            if contract is None:
+                print("Skipping a contract IB did not recognize")
+                continue
+            
+            contracts.append(contract)
+            print(f"Requesting market data for {contract.symbol} ({contract.secType})...")
+            ready.update(await subscriptions.enter_async_context(ezib.subscribe([contract])))
         
         print(f"Created {len(contracts)} contracts")
         
-        # Request market data
-        print("Requesting market data...")
-        await ezib.requestMarketData(contracts)
-        
-        # Wait for data
-        print("Waiting for data (15 seconds)...")
-        await asyncio.sleep(15)
+        # Wait for the first tick of every contract
+        print("Waiting for data...")
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in ready.values())),
+                timeout=15
+            )
+        except asyncio.TimeoutError:
+            print("Timed out waiting for some contracts")
         
         # Display results
         print(f"\n{'='*40}")
@@ -52,49 +61,41 @@ async def main():
         
         for contract in contracts:
             symbol = contract.symbol
-            ticker_id = ezib.tickerId(ezib.contractString(contract))
+            ticker_id = ezib.tickerId(contract)  # looked up by conId, no string building
             is_option = contract.secType in ("OPT", "FOP")
             
             # Choose the correct data source based on contract type
             data_source = ezib.optionsData if is_option else ezib.marketData
             
-            if ticker_id in data_source:
-                data = data_source[ticker_id]
+            data = data_source.get(ticker_id)
+            if data is not None:
                 print(f"\n{symbol} ({contract.secType}):")
                 
-                # Extract latest data from DataFrame
-                if hasattr(data, 'iloc') and len(data) > 0:
-                    latest = data.iloc[-1]
-                    print(f"  Bid: {latest.get('bid', 'N/A')}")
-                    print(f"  Ask: {latest.get('ask', 'N/A')}")
-                    print(f"  Last: {latest.get('last', 'N/A')}")
-                    print(f"  Bid Size: {latest.get('bidsize', 'N/A')}")
-                    print(f"  Ask Size: {latest.get('asksize', 'N/A')}")
-                    print(f"  Last Size: {latest.get('lastsize', 'N/A')}")
+                # Latest tick from the ticker's buffer
+                if len(data) > 0:
+                    latest = data.latest()
+                    print(f"  Bid: {latest.bid}")
+                    print(f"  Ask: {latest.ask}")
+                    print(f"  Last: {latest.last}")
+                    print(f"  Bid Size: {latest.bidsize}")
+                    print(f"  Ask Size: {latest.asksize}")
+                    print(f"  Last Size: {latest.lastsize}")
                     
                     # Show additional data for options
                     if is_option:
-                        print(f"  Implied Vol: {latest.get('iv', 'N/A')}")
-                        print(f"  Delta: {latest.get('delta', 'N/A')}")
-                        print(f"  Gamma: {latest.get('gamma', 'N/A')}")
-                        print(f"  Open Interest: {latest.get('oi', 'N/A')}")
+                        print(f"  Implied Vol: {latest.iv}")
+                        print(f"  Delta: {latest.delta}")
+                        print(f"  Gamma: {latest.gamma}")
+                        print(f"  Open Interest: {latest.oi}")
                 else:
-                    print(f"  Data format: {type(data)}")
+                    print("  No ticks received")
             else:
                 data_type = "optionsData" if is_option else "marketData"
                 print(f"\n{symbol}: No data received (checked {data_type})")
-        
-        # Cancel requests
-        ezib.cancelMarketData(contracts)
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        
-    finally:
-        if ezib.connected:
-            ezib.disconnect()
-            print("Disconnected")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        run(main())
+    except ConnectionError as e:
+        print(f"Failed to connect: {e}")
\ No newline at end of file
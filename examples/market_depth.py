@@ -11,7 +11,7 @@ Note: Requires market depth subscriptions and permissions.
 """
 
 import asyncio
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, run
 
 
 async def main():
@@ -30,10 +30,10 @@ async def main():
         print("Connected! Creating contracts...")
         
         # Create contracts (forex typically good for market depth)
-        forex_contract = await ezib.createForexContract("EUR", currency="USD")
-        stock_contract = await ezib.createStockContract("AAPL")
-        
-        contracts = [forex_contract, stock_contract]
+        contracts = await asyncio.gather(
+            ezib.createForexContract("EUR", currency="USD"),
+            ezib.createStockContract("AAPL")
+        )
         print(f"Created {len(contracts)} contracts")
         
         # Check if requestMarketDepth exists
@@ -65,11 +65,11 @@ async def main():
                 
             # Show regular market data for comparison
             for contract in contracts:
-                if contract.symbol in ezib.marketData:
-                    data = ezib.marketData[contract.symbol]
-                    bid = data.get('bid', 'N/A')
-                    ask = data.get('ask', 'N/A')
-                    print(f"{contract.symbol}: Bid={bid} Ask={ask}")
+                ticker_id = ezib.tickerId(contract)
+                data = ezib.marketData.get(ticker_id)
+                if data is not None:
+                    latest = data.latest()
+                    print(f"{contract.symbol}: Bid={latest.bid} Ask={latest.ask}")
         
         print(f"\n=== SUMMARY ===")
         print("Market depth requires:")
@@ -91,4 +91,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -11,7 +11,7 @@ WARNING: This places real orders! Use paper trading account.
 """
 
 import asyncio
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, run
 
 
 async def main():
@@ -38,9 +38,11 @@ async def main():
         await asyncio.sleep(3)
         
         current_price = None
-        if contract.symbol in ezib.marketData:
-            data = ezib.marketData[contract.symbol]
-            current_price = data.get('last') or data.get('bid')
+        ticker_id = ezib.tickerId(contract)
+        data = ezib.marketData.get(ticker_id)
+        if data is not None:
+            latest = data.latest()
+            current_price = latest.last if latest.last > 0 else latest.bid
             print(f"Current price: ${current_price}")
         
         # Example 1: Market Order
@@ -50,19 +52,22 @@ async def main():
         
         if trade:
             print(f"Market order placed. Order ID: {trade.order.orderId}")
-            await asyncio.sleep(2)
+            try:
+                await asyncio.wait_for(trade.filledEvent, timeout=10)
+            except asyncio.TimeoutError:
+                pass
             print(f"Status: {trade.orderStatus.status}")
         
         # Example 2: Limit Order (if we have current price)
-        if current_price:
+        if current_price and current_price > 0:
             print("\n=== LIMIT ORDER ===")
             limit_price = round(current_price * 0.99, 2)
             limit_order = ezib.createOrder(quantity=1, price=limit_price)
-            limit_trade = ezib.placeOrder(contract, limit_order)
+            # A resting limit order will not fill; wait for TWS to acknowledge it
+            limit_trade = await ezib.placeOrderAsync(contract, limit_order)
             
             if limit_trade:
                 print(f"Limit order placed at ${limit_price}. Order ID: {limit_trade.order.orderId}")
-                await asyncio.sleep(2)
                 print(f"Status: {limit_trade.orderStatus.status}")
         
         # Show positions
@@ -89,4 +94,4 @@ async def main():
 if __name__ == "__main__":
     print("WARNING: This example places real orders!")
     print("Uncomment the line below to run:")
-    # asyncio.run(main())
\ No newline at end of file
+    # run(main())
\ No newline at end of file
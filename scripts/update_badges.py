@@ -4,28 +4,58 @@ Script to update badges in README.md based on test results.
 Usage: python scripts/update_badges.py
 """
 
+import os
 import re
-import subprocess
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ROOT = Path(__file__).parent.parent
+
+COVERAGE_BADGE_RE = re.compile(
+    r'!\[Coverage\]\(https://img\.shields\.io/badge/coverage-\d+%25-\w+\.svg\?style=flat\)'
+)
+COVERAGE_INFO_RE = re.compile(r'Current coverage: \*\*\d+%\*\*')
+
+
+def coverage_is_fresh(coverage_file):
+    """Check whether coverage.json is newer than every source and test file."""
+    if not coverage_file.exists():
+        return False
+
+    generated = coverage_file.stat().st_mtime
+    sources = [*ROOT.glob("src/ezib_async/**/*.py"), *ROOT.glob("tests/**/*.py")]
+    return all(path.stat().st_mtime <= generated for path in sources)
+
 
 def get_coverage_data():
     """Get coverage data from coverage report."""
     try:
-        # Run coverage and capture output
-        subprocess.run(
-            ["pytest", "tests/", "-m", "not integration", "--cov=src/ezib_async", "--cov-report=json", "--quiet"],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
+        coverage_file = ROOT / "coverage.json"
+
+        # `make test-coverage` has usually just written the report; only
+        # run the unit tests (in this interpreter) when it is missing or stale
+        if not coverage_is_fresh(coverage_file):
+            import pytest
+
+            cwd = os.getcwd()
+            os.chdir(ROOT)
+            try:
+                pytest.main(
+                    ["tests/", "-m", "not integration", "--cov=src/ezib_async", "--cov-report=json", "--quiet"]
+                )
+            finally:
+                os.chdir(cwd)
         
         # Read coverage.json
-        coverage_file = Path(__file__).parent.parent / "coverage.json"
         if coverage_file.exists():
-            with open(coverage_file) as f:
-                data = json.load(f)
+            with open(coverage_file, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             total_coverage = int(data['totals']['percent_covered'])
             return total_coverage
@@ -36,11 +66,9 @@ def get_coverage_data():
     return None
 
 
-
-
 def update_badges():
     """Update badges in README.md"""
-    readme_path = Path(__file__).parent.parent / "README.md"
+    readme_path = ROOT / "README.md"
     
     if not readme_path.exists():
         print("README.md not found")
@@ -56,8 +84,7 @@ def update_badges():
     print(f"Coverage: {coverage}%")
     
     # Read README
-    with open(readme_path) as f:
-        content = f.read()
+    original = content = readme_path.read_text()
     
     # Determine coverage color
     if coverage >= 90:
@@ -70,18 +97,21 @@ def update_badges():
         coverage_color = "red"
     
     # Update coverage badge
-    coverage_pattern = r'!\[Coverage\]\(https://img\.shields\.io/badge/coverage-\d+%25-\w+\.svg\?style=flat\)'
     coverage_badge = f"![Coverage](https://img.shields.io/badge/coverage-{coverage}%25-{coverage_color}.svg?style=flat)"
-    content = re.sub(coverage_pattern, coverage_badge, content)
+    content = COVERAGE_BADGE_RE.sub(coverage_badge, content)
     
     # Update coverage info in Testing section
-    coverage_info_pattern = r'Current coverage: \*\*\d+%\*\*'
     coverage_info = f"Current coverage: **{coverage}%**"
-    content = re.sub(coverage_info_pattern, coverage_info, content)
+    content = COVERAGE_INFO_RE.sub(coverage_info, content)
+    
+    if content == original:
+        print("Badges already up to date")
+        return
     
-    # Write back to README
-    with open(readme_path, 'w') as f:
-        f.write(content)
+    # Write back to README atomically
+    tmp_path = readme_path.with_suffix(".md.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, readme_path)
     
     print(f"✅ Updated coverage badge: {coverage}%")
 
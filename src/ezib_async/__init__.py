@@ -22,20 +22,60 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-# try:
-#     import uvloop
-#     uvloop.install()
-# except ImportError:
-#     pass
+import asyncio
+import importlib
 
 from .version import __version__
-from .ezib import ezIBAsync
+
+# ezib (ib_async, numpy, pandas) is imported on first use, so importing the
+# package for run() or __version__ stays cheap (PEP 562)
+_LAZY = {
+    "ezIBAsync": ".ezib",
+    "TickerRing": ".ezib",
+    "get_shared": ".ezib",
+    "session": ".ezib",
+    "util": ".util",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = module if name == "util" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
+
+def run(main):
+    """
+    Run a coroutine to completion, on uvloop when it is installed.
+
+    Args:
+        main: Coroutine to run, typically ``main()``
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
 
 # export main classes for easy import
 __all__ = [
     "ezIBAsync",
+    "TickerRing",
+    "get_shared",
+    "session",
+    "run",
     "util",
     "__version__",
 ]
-
-import ezib_async.util as util
@@ -22,11 +22,27 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import os
+import csv
 import sys
+import math
+import dataclasses
+import pickle
+import random
+import bisect
+import socket
+import time
+import weakref
 import asyncio
 import logging
 
-from pandas import DataFrame, Series
+import numpy as np
+from collections import namedtuple
+from datetime import datetime
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import attrgetter
+from pandas import DataFrame, Series, Timestamp, to_datetime
 from typing import Dict, List
 from ib_async import (
     IB,
@@ -41,6 +57,7 @@ from ib_async import (
     Index,
     ComboLeg,
     Order,
+    Trade,
 )
 from enum import Enum
 from eventkit import Event
@@ -50,6 +67,95 @@ if sys.version_info < (3, 11):
     raise SystemError("ezIBAsync requires Python version >= 3.11")
 
 
+# futures month codes, indexed by month number
+MONTH_CODES = ("", "F", "G", "H", "J", "K", "M", "N", "Q", "U", "V", "X", "Z")
+
+# contractDetails() result for contracts whose details are not downloaded yet
+DEFAULT_CONTRACT_DETAILS = {
+    "tickerId": 0,
+    "category": None,
+    "contractMonth": "",
+    "downloaded": False,
+    "evMultiplier": 0,
+    "evRule": None,
+    "industry": None,
+    "liquidHours": "",
+    "longName": "",
+    "marketName": "",
+    "minTick": 0.01,
+    "orderTypes": "",
+    "priceMagnifier": 0,
+    "subcategory": None,
+    "timeZoneId": "",
+    "tradingHours": "",
+    "underConId": 0,
+    "validExchanges": "SMART",
+    "contracts": [Contract()],
+    "conId": 0,
+    "summary": {
+        "conId": 0,
+        "currency": "USD",
+        "exchange": "SMART",
+        "lastTradeDateOrContractMonth": "",
+        "includeExpired": False,
+        "localSymbol": "",
+        "multiplier": "",
+        "primaryExch": None,
+        "right": None,
+        "secType": "",
+        "strike": 0.0,
+        "symbol": "",
+        "tradingClass": "",
+    },
+}
+
+def _default_contract_details():
+    """Fresh copy of DEFAULT_CONTRACT_DETAILS, nested summary/contracts included."""
+    details = dict(DEFAULT_CONTRACT_DETAILS)
+    details["summary"] = dict(details["summary"])
+    details["contracts"] = [Contract()]
+    return details
+
+
+# contract fields making up a contract tuple, in order
+_CONTRACT_TUPLE = attrgetter(
+    "symbol",
+    "secType",
+    "exchange",
+    "currency",
+    "lastTradeDateOrContractMonth",
+    "strike",
+    "right",
+)
+
+# contract fields copied into a contract details "summary"
+_SUMMARY_FIELDS = tuple(DEFAULT_CONTRACT_DETAILS["summary"])
+
+
+def _contract_summary(contract):
+    """Snapshot the summary fields of a contract into a new dict."""
+    return {field: getattr(contract, field, None) for field in _SUMMARY_FIELDS}
+
+
+DEFAULT_CONTRACT_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "ezib_async", "contracts.pkl"
+)
+
+
+# IB instances by (host, port, client id), see ezIBAsync.from_pool
+_ib_pool = weakref.WeakValueDictionary()
+
+# id(IB) -> the ezIBAsync handling its events; one wrapper per IB instance
+_ib_owners = weakref.WeakValueDictionary()
+
+
+@lru_cache(maxsize=32)
+def _resolution_decimals(res):
+    """Decimal places of a tick size such as 0.25, or None for whole numbers."""
+    res = str(res)
+    return len(res.split(".")[1]) if "." in res else None
+
+
 class ConnectionStatus(Enum):
     CONNECTED = "CONNECTED"
     INTERMEDIATE = (
@@ -58,6 +164,194 @@ class ConnectionStatus(Enum):
     DISCONNECTED = "DISCONNECTED"  # peer connection closed
 
 
+class TickerRing:
+    """
+    Fixed-capacity tick history for a single ticker.
+
+    Each field is kept in its own NumPy array (structure of arrays) and rows
+    are written in place at a wrapping cursor, so ingesting a tick costs a
+    handful of scalar stores instead of a DataFrame update. The arrays are
+    allocated on the first write, so an unused ring costs next to nothing,
+    and a DataFrame is only built when to_df() is called.
+
+    Prices are stored as fixed-point int64 (value * PRICE_SCALE), with the
+    int64 minimum as the missing-value sentinel. Sizes and volume stay float64
+    so fractional quantities (crypto, fractional shares) are kept exactly.
+    Readers always get floats back, with NaN for missing values.
+    """
+
+    PRICE_SCALE = 1_000_000  # 6 decimals, enough for fractional FX pips
+
+    __slots__ = ("dtypes", "scales", "columns", "ts", "capacity", "i", "n", "_tick")
+
+    def __init__(self, columns, capacity=64, fixed=None, sizes=(), _tick=None):
+        """
+        Args:
+            columns: Names of the fields to store
+            capacity: Number of ticks kept before the oldest are overwritten
+            fixed: Mapping of field name -> scale for fixed-point int64 fields
+            sizes: Names of size/volume fields, stored as float64
+        """
+        fixed = fixed or {}
+        self.capacity = capacity
+        self.dtypes = {}  # name -> (dtype, missing value)
+        self.scales = {}  # name -> (scale, missing sentinel) for integer fields
+
+        for name in columns:
+            if name in fixed:
+                na = np.iinfo(np.int64).min
+                self.dtypes[name] = (np.int64, na)
+                self.scales[name] = (fixed[name], na)
+            elif name in sizes:
+                self.dtypes[name] = (np.float64, np.nan)
+            else:
+                self.dtypes[name] = (np.float32, np.nan)
+
+        self.columns = {}  # name -> array, see _allocate
+        self.ts = None  # epoch nanoseconds
+        self.i = 0  # next write slot
+        self.n = 0  # rows held
+        self._tick = _tick or namedtuple("Tick", ("datetime",) + tuple(columns))
+
+    def __len__(self):
+        return self.n
+
+    def _allocate(self):
+        capacity = self.capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.columns = {
+            name: np.full(capacity, na, dtype=dtype)
+            for name, (dtype, na) in self.dtypes.items()
+        }
+
+    def _encode(self, name, value):
+        if name not in self.scales:
+            return value
+        scale, na = self.scales[name]
+        if value is None or not math.isfinite(value):
+            return na
+        return round(value * scale)
+
+    def _decode(self, name, value):
+        if name not in self.scales:
+            return float(value)
+        scale, na = self.scales[name]
+        if value == na:
+            return math.nan
+        return int(value) / scale
+
+    def push(self, time, **values):
+        """
+        Append a tick. Fields not given are carried over from the previous tick.
+
+        Args:
+            time: Tick time (datetime)
+            **values: Field values by column name
+        """
+        if self.ts is None:
+            self._allocate()
+
+        i = self.i
+        prev = i - 1  # -1 wraps to the last slot
+        for name, column in self.columns.items():
+            if name in values:
+                column[i] = self._encode(name, values[name])
+            else:
+                column[i] = column[prev]
+
+        self.ts[i] = int(time.timestamp() * 1e9) if time is not None else 0
+        self.i = (i + 1) % self.capacity
+        if self.n < self.capacity:
+            self.n += 1
+
+    def update(self, **values):
+        """
+        Overwrite fields of the most recent tick.
+
+        Args:
+            **values: Field values by column name
+        """
+        if self.ts is None:
+            self._allocate()
+
+        last = self.i - 1
+        columns = self.columns
+        for name, value in values.items():
+            columns[name][last] = self._encode(name, value)
+
+    def latest(self):
+        """
+        Returns:
+            namedtuple with the datetime and fields of the most recent tick
+        """
+        last = self.i - 1
+        if self.n == 0:
+            return self._tick(None, *([math.nan] * len(self.dtypes)))
+
+        return self._tick(
+            Timestamp(int(self.ts[last]), unit="ns", tz="UTC"),
+            *(self._decode(name, column[last]) for name, column in self.columns.items()),
+        )
+
+    def _order(self):
+        # slot indices, oldest first
+        if self.n < self.capacity:
+            return slice(0, self.n)
+        return np.roll(np.arange(self.capacity), -self.i)
+
+    def __getitem__(self, name):
+        if name not in self.dtypes:
+            raise KeyError(name)
+        if self.ts is None:
+            return np.empty(0)
+
+        values = self.columns[name][self._order()]
+        if name not in self.scales:
+            return values
+        scale, na = self.scales[name]
+        return np.where(values == na, np.nan, values / scale)
+
+    def get(self, name, default=None):
+        if name not in self.dtypes:
+            return default
+        return self[name]
+
+    def to_df(self):
+        """
+        Returns:
+            DataFrame of the stored ticks, oldest first, indexed by datetime
+        """
+        ts = self.ts[self._order()] if self.ts is not None else np.empty(0, dtype=np.int64)
+        df = DataFrame({name: self[name] for name in self.dtypes})
+        df.index = to_datetime(ts, unit="ns", utc=True)
+        df.index.name = "datetime"
+        return df
+
+    def empty(self):
+        """
+        Returns:
+            Empty TickerRing with the same columns and capacity; nothing is
+            allocated until its first tick
+        """
+        ring = TickerRing((), self.capacity, _tick=self._tick)
+        ring.dtypes = self.dtypes
+        ring.scales = self.scales
+        return ring
+
+    def copy(self):
+        """
+        Returns:
+            TickerRing with the same columns, capacity and data
+        """
+        ring = self.empty()
+        if self.ts is not None:
+            ring.columns = {name: column.copy() for name, column in self.columns.items()}
+            ring.ts = self.ts.copy()
+        ring.i = self.i
+        ring.n = self.n
+        return ring
+
+
 class ezIBAsync:
     """
     Asynchronous Interactive Brokers API client.
@@ -89,12 +383,32 @@ class ezIBAsync:
         if val is None:
             return None
 
-        if decimals is None and "." in str(res):
-            decimals = len(str(res).split(".")[1])
+        if decimals is None:
+            decimals = _resolution_decimals(res)
 
         return round(round(val / res) * res, decimals)
 
-    def __init__(self, ibhost="127.0.0.1", ibport=4001, ibclient=1, account=None):
+    @staticmethod
+    def offsetPrice(price, bps, res=0.01):
+        """
+        Offset a price by basis points using integer tick arithmetic.
+
+        Args:
+            price: Reference price
+            bps: Offset in basis points (200 = +2%, -100 = -1%)
+            res: Tick size; must divide 1 evenly (0.01, 0.25, 1/32, ...)
+
+        Returns:
+            Offset price, rounded half-up to the nearest tick
+        """
+        ticks_per_unit = int(1 / res + 0.5)
+        ticks = int(price * ticks_per_unit + 0.5)
+        return (ticks * (10000 + bps) + 5000) // 10000 / ticks_per_unit
+
+    def __init__(
+        self, ibhost="127.0.0.1", ibport=4001, ibclient=1, account=None,
+        contract_cache=None, ib=None, tick_history=64, contract_cache_ttl=86400
+    ):
         """
         Initialize the ezIBAsync client.
 
@@ -103,6 +417,21 @@ class ezIBAsync:
             ibport (int): Port number for IB connection
             ibclient (int): Client ID for IB connection
             account (str, optional): Default account to use
+            contract_cache (str|bool, optional): Path of an on-disk cache of
+                qualified contracts, or True for ~/.cache/ezib_async/contracts.pkl.
+                Disabled by default.
+            contract_cache_ttl (float): Seconds a cached contract and its
+                details are served without asking TWS; older entries are
+                qualified again
+            ib (IB, optional): Existing ib_async IB instance to use instead of
+                creating a new one, e.g. when rebuilding the wrapper for the
+                same gateway. It may already be connected. Only one ezIBAsync
+                handles an IB instance's events: a previous wrapper of the same
+                instance is detached and stops receiving updates
+            tick_history (int): Ticks kept per ticker in marketData and
+                optionsData before the oldest are overwritten. Each ticker
+                allocates its buffer on its first tick; at the default of 64
+                that is about 5 KB per stock and 14 KB per option
         """
         self._setup_events()
 
@@ -114,7 +443,10 @@ class ezIBAsync:
 
         # auto-construct for every contract/order
         self.tickerIds = {0: "SYMBOL"}
+        self._symbolTickerIds = {"SYMBOL": 0}  # reverse of tickerIds
+        self._conIdTickerIds = {}  # conId -> tickerId, for streamed contracts
         self.contracts = {}
+        self._contractsByConId = {}  # conId -> registered contract
         self.orders = {}
         self.account_orders = {}
         self.account_symbols_orders = {}
@@ -127,26 +459,41 @@ class ezIBAsync:
         self._positions = {}
         self._portfolios = {}
         self.contract_details = {}  # multiple expiry/strike/side contracts
+        self._detailsEvents = {}  # tickerId -> asyncio.Event, set once details are stored
+        self._sortedCache = {}  # tickerId -> sorted expirations/strikes of its details
         self.localSymbolExpiry = {}
+        self._contract_strings = {}  # (contract tuple, separator) -> string
 
         self._logger = logging.getLogger("ezib_async.ezib")
 
+        # qualified contracts persisted across runs (opt-in)
+        if contract_cache is True:
+            contract_cache = DEFAULT_CONTRACT_CACHE
+        self._contract_cache_path = contract_cache or None
+        self._contract_cache_ttl = contract_cache_ttl
+        self._contract_cache = None  # loaded lazily
+        self._contract_cache_dirty = False  # entries not written to disk yet
+        self._contract_cache_save = None  # pending write, see _scheduleContractCacheSave
+        self._tasks = set()  # background tasks, see _createTask
+        self._loop = None  # event loop of the current connection
+        self._reconnect_task = None  # at most one reconnect loop at a time
+        self._user_handlers = {}  # IB event name -> set of user callbacks
+
+        # readiness signals, set when the first account / tick payload arrives
+        self.account_ready = asyncio.Event()
+        self.market_ready = {}  # idx = tickerId
+
         # holds market data
-        tickDF = DataFrame(
-            index=range(1),
-            data={
-                "datetime": Series(dtype="datetime64[ns]"),
-                "iv": Series(dtype=float),
-                "bid": Series(dtype=float),
-                "bidsize": Series(dtype=float),
-                "ask": Series(dtype=float),
-                "asksize": Series(dtype=float),
-                "last": Series(dtype=float),
-                "lastsize": Series(dtype=float),
-            },
-        )
-        tickDF.set_index("datetime", inplace=True)
-        self.marketData = {0: tickDF}  # idx = tickerId
+        price = TickerRing.PRICE_SCALE
+        self.marketData = {
+            0: TickerRing(
+                ("iv", "bid", "bidsize", "ask", "asksize", "last", "lastsize",
+                 "volume", "oi"),
+                tick_history,
+                fixed={"bid": price, "ask": price, "last": price},
+                sizes=("bidsize", "asksize", "lastsize", "volume", "oi"),
+            )
+        }  # idx = tickerId
 
         # holds orderbook data
         l2DF = DataFrame(
@@ -161,61 +508,72 @@ class ezIBAsync:
         self.marketDepthData = {0: l2DF}  # idx = tickerId
 
         # holds options data
-        optionsDF = DataFrame(
-            index=range(1),
-            data={
-                "datetime": Series(dtype="datetime64[ns]"),
-                "iv": Series(dtype=float),
-                "oi": Series(dtype=float),
-                "bid": Series(dtype=float),
-                "bidsize": Series(dtype=float),
-                "ask": Series(dtype=float),
-                "asksize": Series(dtype=float),
-                "last": Series(dtype=float),
-                "lastsize": Series(dtype=float),
-                "volume": Series(dtype=float),
-                "underlying": Series(dtype=float),
-                # opt field
-                "price": Series(dtype=float),
-                "dividend": Series(dtype=float),
-                "imp_vol": Series(dtype=float),
-                "delta": Series(dtype=float),
-                "gamma": Series(dtype=float),
-                "vega": Series(dtype=float),
-                "theta": Series(dtype=float),
-                "last_price": Series(dtype=float),
-                "last_dividend": Series(dtype=float),
-                "last_imp_vol": Series(dtype=float),
-                "last_delta": Series(dtype=float),
-                "last_gamma": Series(dtype=float),
-                "last_vega": Series(dtype=float),
-                "last_theta": Series(dtype=float),
-                "bid_price": Series(dtype=float),
-                "bid_dividend": Series(dtype=float),
-                "bid_imp_vol": Series(dtype=float),
-                "bid_delta": Series(dtype=float),
-                "bid_gamma": Series(dtype=float),
-                "bid_vega": Series(dtype=float),
-                "bid_theta": Series(dtype=float),
-                "ask_price": Series(dtype=float),
-                "ask_dividend": Series(dtype=float),
-                "ask_imp_vol": Series(dtype=float),
-                "ask_delta": Series(dtype=float),
-                "ask_gamma": Series(dtype=float),
-                "ask_vega": Series(dtype=float),
-                "ask_theta": Series(dtype=float),
-            },
-        )
-        optionsDF.set_index("datetime", inplace=True)
-        self.optionsData = {0: optionsDF}  # idx = tickerId
+        self.optionsData = {
+            0: TickerRing(
+                (
+                    "iv", "oi", "bid", "bidsize", "ask", "asksize", "last",
+                    "lastsize", "volume", "underlying",
+                    # opt field
+                    "price", "dividend", "imp_vol", "delta", "gamma", "vega", "theta",
+                    "last_price", "last_dividend", "last_imp_vol", "last_delta",
+                    "last_gamma", "last_vega", "last_theta",
+                    "bid_price", "bid_dividend", "bid_imp_vol", "bid_delta",
+                    "bid_gamma", "bid_vega", "bid_theta",
+                    "ask_price", "ask_dividend", "ask_imp_vol", "ask_delta",
+                    "ask_gamma", "ask_vega", "ask_theta",
+                ),
+                tick_history,
+                fixed={
+                    "bid": price, "ask": price, "last": price, "underlying": price,
+                    "price": price, "last_price": price, "bid_price": price,
+                    "ask_price": price,
+                },
+                sizes=("bidsize", "asksize", "lastsize", "volume", "oi"),
+            )
+        }  # idx = tickerId
 
-        # Initialize the IB client directly
-        self.ib = IB()
-        self.connected = False
+        # Initialize the IB client directly, unless one was handed in
+        self.ib = ib if ib is not None else IB()
         self._disconnected_by_user = False
 
+        # a connected IB handed in will not emit connectedEvent again;
+        # connectAsync() then runs the session setup without reconnecting
+        self._adopted = ib is not None and ib.isConnected()
+        self.connected = self._adopted
+
+        if ib is not None:
+            previous = _ib_owners.get(id(ib))
+            if previous is not None:
+                previous._detachFromIB()
+            _ib_owners[id(ib)] = self
+
         self._register_events_handler()
 
+    @classmethod
+    def from_pool(cls, ibhost="127.0.0.1", ibport=4001, ibclient=1, **kwargs):
+        """
+        Create a client on the shared IB instance for an endpoint.
+
+        Repeated calls for the same (ibhost, ibport, ibclient) reuse one IB
+        instance, and its connection if it is still up, instead of building a
+        new one. The previous client of that instance is detached (see ib in
+        __init__). The instance is dropped once no client references it.
+
+        Args:
+            ibhost (str): Host address for IB connection
+            ibport (int): Port number for IB connection
+            ibclient (int): Client ID for IB connection
+            **kwargs: Other ezIBAsync arguments
+
+        Returns:
+            ezIBAsync: New client using the pooled IB instance
+        """
+        key = (ibhost, ibport, ibclient)
+        ib = _ib_pool.get(key)
+        if ib is None:
+            ib = _ib_pool[key] = IB()
+        return cls(ibhost, ibport, ibclient, ib=ib, **kwargs)
+
     def _setup_events(self):
         # events
         self.pendingQuotersEvent = Event("pendingQuotersEvent")
@@ -235,6 +593,11 @@ class ezIBAsync:
             ibclient (int, optional): Client ID for IB connection
             account (str, optional): Default account to use
         """
+        # Already connected: nothing to do, and the live connection's
+        # parameters must not be overwritten
+        if self.connected and not self._adopted:
+            return
+
         # Use provided parameters or fall back to stored values
         self._ibhost = ibhost if ibhost is not None else self._ibhost
         self._ibport = ibport if ibport is not None else self._ibport
@@ -243,55 +606,65 @@ class ezIBAsync:
             account if account is not None else self._default_account
         )
 
-        try:
-            # Connect using the IB client
-            if self.connected:
-                return
+        self._loop = asyncio.get_running_loop()
 
-            self._logger.info(
-                f"Connecting to IB at {self._ibhost}:{self._ibport} (client ID: {self._ibclient})"
-            )
-            await self.ib.connectAsync(
-                host=self._ibhost,
-                port=self._ibport,
-                clientId=self._ibclient,
-                account=self._default_account,
-            )
+        try:
+            if self._adopted:
+                # the IB instance handed to __init__ is already connected
+                self._adopted = False
+                self._logger.info("Using the existing IB connection")
+            else:
+                # Connect using the IB client
+                self._logger.info(
+                    "Connecting to IB at %s:%s (client ID: %s)",
+                    self._ibhost,
+                    self._ibport,
+                    self._ibclient,
+                )
+                await self.ib.connectAsync(
+                    host=self._ibhost,
+                    port=self._ibport,
+                    clientId=self._ibclient,
+                    account=self._default_account,
+                )
 
-            # Update connection state
-            self.connected = self.ib.isConnected()
+            # self.connected was set by connectedEvent, emitted once the
+            # startup sync completed
             self._logger.info("Connected to IB successfully")
+            self._tuneSocket()
             self._disconnected_by_user = False
 
             # Validate default account
             if self._default_account is not None:
                 if self._default_account not in self.accountCodes:
                     self._logger.warning(
-                        f"Default account {self._default_account} not found in available accounts: {self.accountCodes}"
+                        "Default account %s not found in available accounts: %s",
+                        self._default_account,
+                        self.accountCodes,
                     )
                     # Switch to first available account
                     self._default_account = self.accountCodes[0]
                     self._logger.warning(
-                        f"Switched default account to {self._default_account}"
+                        "Switched default account to %s", self._default_account
                     )
             else:
                 self._default_account = self.accountCodes[0]
                 self.ib.client.reqAccountUpdates(True, self._default_account)
 
-            # Check if we already have open orders from startup fetch
-            # If not, request them explicitly
-            await asyncio.sleep(1)  # Give startup fetch time to complete
+            # ib.connectAsync returns once the startup fetch (open orders
+            # included) has completed, so open trades are already known here.
+            # If there are none, request them explicitly
             if len(self.ib.openTrades()) == 0:
                 # Only request if no open orders were fetched during startup
                 await self.requestAllOpenOrders()
             else:
-                self._logger.info(f"Found {len(self.ib.openTrades())} open orders from startup fetch")
+                self._logger.info("Found %s open orders from startup fetch", len(self.ib.openTrades()))
                 # Process existing open orders
                 for trade in self.ib.openTrades():
                     self._onOpenOrderHandler(trade)
 
         except Exception as e:
-            self._logger.error(f"Error connecting to IB: {e}")
+            self._logger.error("Error connecting to IB: %s", e)
             self.connected = False
             return False
 
@@ -302,26 +675,103 @@ class ezIBAsync:
 
         """
         if self.ib is not None:
-            # disconnection handler
-            self.ib.disconnectedEvent += self._onDisconnectedHandler
+            for event_name, handler in self._eventHandlers():
+                event = getattr(self.ib, event_name)
+                event += handler
 
+    def _eventHandlers(self):
+        """
+        Returns:
+            tuple of (IB event name, handler) pairs this client listens to
+        """
+        return (
+            # connection state handlers
+            ("connectedEvent", self._onConnectedHandler),
+            ("disconnectedEvent", self._onDisconnectedHandler),
             # accounts info handlers
-            self.ib.accountValueEvent += self._onAccountValueHandler
-            self.ib.accountSummaryEvent += self._onAccountSummaryHandler
-            self.ib.positionEvent += self._onPositionUpdateHandler
-            self.ib.updatePortfolioEvent += self._onPortfolioUpdateHandler
-
+            ("accountValueEvent", self._onAccountValueHandler),
+            ("accountSummaryEvent", self._onAccountSummaryHandler),
+            ("positionEvent", self._onPositionUpdateHandler),
+            ("updatePortfolioEvent", self._onPortfolioUpdateHandler),
             # market / options / depth data handler
-            self.ib.pendingTickersEvent += self._onPendingTickersHandler
-
+            ("pendingTickersEvent", self._onPendingTickersHandler),
             # order event handlers
-            self.ib.openOrderEvent += self._onOpenOrderHandler
-            self.ib.orderStatusEvent += self._onOrderStatusHandler
-            self.ib.execDetailsEvent += self._onExecDetailsHandler  # For order fills
-            self.ib.commissionReportEvent += self._onCommissionReportHandler
-            
+            ("openOrderEvent", self._onOpenOrderHandler),
+            ("orderStatusEvent", self._onOrderStatusHandler),
+            ("execDetailsEvent", self._onExecDetailsHandler),  # For order fills
+            ("commissionReportEvent", self._onCommissionReportHandler),
             # error handler
-            self.ib.errorEvent += self._onErrorHandler
+            ("errorEvent", self._onErrorHandler),
+        )
+
+    def _detachFromIB(self):
+        """
+        Stop handling self.ib's events after another client took it over.
+
+        The connection itself is left open for the new owner; this client
+        only drops its handlers and background tasks and reports itself
+        disconnected, so it never starts a competing reconnect loop.
+        """
+        self._logger.warning("IB instance taken over by another ezIBAsync, detaching")
+        self._disconnected_by_user = True
+        for task in list(self._tasks):
+            task.cancel()
+
+        for event_name, handler in self._eventHandlers():
+            event = getattr(self.ib, event_name)
+            event -= handler
+        self.unregisterHandlers(
+            {name: list(callbacks) for name, callbacks in self._user_handlers.items()}
+        )
+        self.connected = False
+
+    def registerHandlers(self, handlers):
+        """
+        Subscribe user callbacks to ib_async IB events in one pass.
+
+        A callback already registered for an event is not added twice.
+
+        Args:
+            handlers: Mapping of IB event name -> list of callables,
+                      e.g. {"orderStatusEvent": [on_status]}
+
+        Returns:
+            list: Event names that do not exist on the IB client (skipped)
+        """
+        missing = []
+        for event_name, callbacks in handlers.items():
+            event = getattr(self.ib, event_name, None)
+            if event is None:
+                missing.append(event_name)
+                continue
+            registered = self._user_handlers.setdefault(event_name, set())
+            for callback in callbacks:
+                if callback not in registered:
+                    event += callback
+                    registered.add(callback)
+
+        if missing:
+            self._logger.warning("Unknown IB events, handlers not registered: %s", missing)
+        return missing
+
+    def unregisterHandlers(self, handlers):
+        """
+        Unsubscribe callbacks previously added with registerHandlers.
+
+        Args:
+            handlers: Mapping of IB event name -> list of callables
+        """
+        for event_name, callbacks in handlers.items():
+            registered = self._user_handlers.get(event_name)
+            if not registered:
+                continue
+            known = [callback for callback in callbacks if callback in registered]
+            if not known:
+                continue
+            event = getattr(self.ib, event_name)
+            for callback in known:
+                event -= callback
+                registered.discard(callback)
 
     # ---------------------------------------
     async def requestMarketData(self, contracts=None, snapshot=False):
@@ -353,7 +803,11 @@ class ezIBAsync:
             contracts: Contract or list of contracts to request market data for.
                        If None, uses all contracts in self.contracts.
             snapshot: If True, request a snapshot instead of streaming data.
+
+        Returns:
+            dict: tickerId -> asyncio.Event, set when the first tick arrives
         """
+        ready = {}
 
         # Use all contracts if none specified
         if contracts is None:
@@ -364,7 +818,7 @@ class ezIBAsync:
         for contract in contracts:
             # Skip multi-contracts (they need to be expanded first)
             if self.isMultiContract(contract):
-                self._logger.debug(f"Skipping multi-contract: {contract.symbol}")
+                self._logger.debug("Skipping multi-contract: %s", contract.symbol)
                 continue
 
             if snapshot:
@@ -378,10 +832,16 @@ class ezIBAsync:
             try:
                 # Get ticker ID for the contract
                 contractSring = self.contractString(contract)
+                tickerId = self.tickerId(contractSring)
+                if contract.conId:
+                    self._conIdTickerIds[contract.conId] = tickerId
+                if tickerId not in self.market_ready:
+                    self.market_ready[tickerId] = asyncio.Event()
+                ready[tickerId] = self.market_ready[tickerId]
 
                 # Request market data
                 self._logger.info(
-                    f"Requesting market data for {contract.symbol} ({contractSring})"
+                    "Requesting market data for %s (%s)", contract.symbol, contractSring
                 )
 
                 # Request market data
@@ -392,9 +852,11 @@ class ezIBAsync:
 
             except Exception as e:
                 self._logger.error(
-                    f"Error requesting market data for {contract.symbol}: {e}"
+                    "Error requesting market data for %s: %s", contract.symbol, e
                 )
 
+        return ready
+
     # ---------------------------------------
     def requestMarketDepth(self, contracts=None, num_rows=10):
 
@@ -409,7 +871,7 @@ class ezIBAsync:
         for contract in contracts:
             contractSring = self.contractString(contract)
             self._logger.info(
-                f"Requesting market depth for {contract.symbol} ({contractSring})"
+                "Requesting market depth for %s (%s)", contract.symbol, contractSring
             )
 
             ticker = self.ib.reqMktDepth(contract, numRows=num_rows)
@@ -444,20 +906,63 @@ class ezIBAsync:
 
                 # Cancel market data
                 self._logger.info(
-                    f"Canceling depth market data for {contract.symbol} ({contractString})"
+                    "Canceling depth market data for %s (%s)", contract.symbol, contractString
                 )
                 self.ib.cancelMktDepth(contract)
 
             except Exception as e:
                 self._logger.error(
-                    f"Canceling depth market data for {contract.symbol}: {e}"
+                    "Canceling depth market data for %s: %s", contract.symbol, e
                 )
 
     def _handle_orderbook_update(self, ticker):
-        self._logger.debug(f"Orderbook {ticker} received")
+        self._logger.debug("Orderbook %s received", ticker)
         self.updateMarketDepthEvent.emit(ticker)
 
     # ---------------------------------------
+    @asynccontextmanager
+    async def subscribe(self, contracts, snapshot=False):
+        """
+        Stream market data for the duration of an ``async with`` block.
+
+        Market data is cancelled on exit, including early returns and errors.
+
+        Args:
+            contracts: Contract or list of contracts to subscribe to
+            snapshot: If True, request a snapshot instead of streaming data
+
+        Returns:
+            dict: tickerId -> asyncio.Event, as returned by requestMarketData
+        """
+        ready = await self.requestMarketData(contracts, snapshot=snapshot)
+        try:
+            yield ready
+        finally:
+            self.cancelMarketData(contracts)
+
+    async def snapshot(self, contracts):
+        """
+        Get a one-off quote for contracts without opening a streaming feed.
+
+        Args:
+            contracts: Contract or list of contracts to quote
+
+        Returns:
+            dict: contractString -> {"bid", "ask", "last"} (NaN when unavailable)
+        """
+        if not isinstance(contracts, list):
+            contracts = [contracts]
+
+        tickers = await self.ib.reqTickersAsync(*contracts)
+        return {
+            self.contractString(ticker.contract): {
+                "bid": ticker.bid,
+                "ask": ticker.ask,
+                "last": ticker.last,
+            }
+            for ticker in tickers
+        }
+
     def cancelMarketData(self, contracts=None):
         """
         Cancel streaming market data for contracts.
@@ -486,13 +991,13 @@ class ezIBAsync:
 
                 # Cancel market data
                 self._logger.info(
-                    f"Canceling market data for {contract.symbol} ({contractString})"
+                    "Canceling market data for %s (%s)", contract.symbol, contractString
                 )
                 self.ib.cancelMktData(contract)
 
             except Exception as e:
                 self._logger.error(
-                    f"Error canceling market data for {contract.symbol}: {e}"
+                    "Error canceling market data for %s: %s", contract.symbol, e
                 )
 
     # -----------------------------------------
@@ -511,8 +1016,9 @@ class ezIBAsync:
         for t in tickers:
 
             contract = t.contract
-            symbol = self.contractString(contract)
-            tickerId = self.tickerId(symbol)
+            tickerId = self._conIdTickerIds.get(contract.conId)
+            if tickerId is None:
+                tickerId = self.tickerId(self.contractString(contract))
 
             # handle market depth
             if tickerId not in self.marketDepthData:
@@ -539,21 +1045,21 @@ class ezIBAsync:
                 df2use = self.optionsData
 
             if tickerId not in df2use:
-                df2use[tickerId] = df2use[0].copy()
+                df2use[tickerId] = df2use[0].empty()
 
             # Update market & options common fields
-            df2use[tickerId].index = [t.time]
-            df2use[tickerId]["timestamp"] = t.time
-            df2use[tickerId]["bid"] = t.bid
-            df2use[tickerId]["bidsize"] = t.bidSize
-            df2use[tickerId]["ask"] = t.ask
-            df2use[tickerId]["asksize"] = t.askSize
-            df2use[tickerId]["last"] = t.last
-            df2use[tickerId]["lastsize"] = t.lastSize
-            df2use[tickerId]["volume"] = t.volume  # trading volume for the day
-            # df2use[tickerId]["vwap"] = t.vwap
-            df2use[tickerId]["iv"] = t.impliedVolatility
-            df2use[tickerId]["oi"] = t.callOpenInterest + t.putOpenInterest
+            df2use[tickerId].push(
+                t.time,
+                bid=t.bid,
+                bidsize=t.bidSize,
+                ask=t.ask,
+                asksize=t.askSize,
+                last=t.last,
+                lastsize=t.lastSize,
+                volume=t.volume,  # trading volume for the day
+                iv=t.impliedVolatility,
+                oi=t.callOpenInterest + t.putOpenInterest,
+            )
 
             if is_option:
                 if t.lastGreeks:
@@ -565,6 +1071,9 @@ class ezIBAsync:
                 if t.askGreeks:
                     self._handleTickOptionComputation(tickerId, t.askGreeks, "ask_")
 
+            if tickerId in self.market_ready:
+                self.market_ready[tickerId].set()
+
             self.pendingQuotersEvent.emit(tickerId)
 
     # -----------------------------------------
@@ -574,51 +1083,55 @@ class ezIBAsync:
         """
 
         def calc_generic_val(data, field):
-            last_val = data["last_" + field].values[-1]
-            bid_val = data["bid_" + field].values[-1]
-            ask_val = data["ask_" + field].values[-1]
+            last_val = getattr(data, "last_" + field)
+            bid_val = getattr(data, "bid_" + field)
+            ask_val = getattr(data, "ask_" + field)
             bid_ask_val = last_val
 
-            if bid_val is not None and ask_val is not None:
+            if not (np.isnan(bid_val) or np.isnan(ask_val)):
                 bid_ask_val = (bid_val + ask_val) / 2
 
-            if last_val is not None:
+            if not np.isnan(last_val):
                 return max([last_val, bid_ask_val])
 
             return bid_ask_val
 
-        # create tick holder for ticker
-        # if msg.tickerId not in self.optionsData.keys():
-        #     self.optionsData[msg.tickerId] = self.optionsData[0].copy()
+        option = self.optionsData[ticker_id]
 
         # save side
-        self.optionsData[ticker_id][col_prepend + "imp_vol"] = computation.impliedVol
-        self.optionsData[ticker_id][col_prepend + "dividend"] = computation.pvDividend
-        self.optionsData[ticker_id][col_prepend + "delta"] = computation.delta
-        self.optionsData[ticker_id][col_prepend + "gamma"] = computation.gamma
-        self.optionsData[ticker_id][col_prepend + "vega"] = computation.vega
-        self.optionsData[ticker_id][col_prepend + "theta"] = computation.theta
-        self.optionsData[ticker_id][col_prepend + "price"] = computation.optPrice
+        option.update(
+            **{
+                col_prepend + "imp_vol": computation.impliedVol,
+                col_prepend + "dividend": computation.pvDividend,
+                col_prepend + "delta": computation.delta,
+                col_prepend + "gamma": computation.gamma,
+                col_prepend + "vega": computation.vega,
+                col_prepend + "theta": computation.theta,
+                col_prepend + "price": computation.optPrice,
+            }
+        )
 
         # save generic/mid
-        option = self.optionsData[ticker_id]
-        self.optionsData[ticker_id]["imp_vol"] = calc_generic_val(option, "imp_vol")
-        self.optionsData[ticker_id]["dividend"] = calc_generic_val(option, "dividend")
-        self.optionsData[ticker_id]["delta"] = calc_generic_val(option, "delta")
-        self.optionsData[ticker_id]["gamma"] = calc_generic_val(option, "gamma")
-        self.optionsData[ticker_id]["vega"] = calc_generic_val(option, "vega")
-        self.optionsData[ticker_id]["theta"] = calc_generic_val(option, "theta")
-        self.optionsData[ticker_id]["price"] = calc_generic_val(option, "price")
-        self.optionsData[ticker_id]["underlying"] = computation.undPrice
+        latest = option.latest()
+        option.update(
+            imp_vol=calc_generic_val(latest, "imp_vol"),
+            dividend=calc_generic_val(latest, "dividend"),
+            delta=calc_generic_val(latest, "delta"),
+            gamma=calc_generic_val(latest, "gamma"),
+            vega=calc_generic_val(latest, "vega"),
+            theta=calc_generic_val(latest, "theta"),
+            price=calc_generic_val(latest, "price"),
+            underlying=computation.undPrice,
+        )
 
     def _onErrorHandler(self, req_id, error_code, error_string, contract):
         """
         https://interactivebrokers.github.io/tws-api/message_codes.html
         """
         if error_code == 1100:
-            self._logger.info(f"Error: {req_id}, {error_code}, {error_string}")
+            self._logger.info("Error: %s, %s, %s", req_id, error_code, error_string)
         else:
-            self._logger.error(f"Error: {req_id}, {error_code}, {error_string}")
+            self._logger.error("Error: %s, %s, %s", req_id, error_code, error_string)
 
     # ---------------------------------------
     # Accounts handling
@@ -637,10 +1150,11 @@ class ezIBAsync:
 
             # Set value
             self._accounts[value.account][value.tag] = value.value
+            self.account_ready.set()
             # self._logger.debug(f"Account value update: {value.account} - {value.tag}: {value.value}")
 
         except Exception as e:
-            self._logger.error(f"Error handling account value update: {e}")
+            self._logger.error("Error handling account value update: %s", e)
 
     # ---------------------------------------
     def _onAccountSummaryHandler(self, summary):
@@ -658,11 +1172,11 @@ class ezIBAsync:
             # Set value
             self._accounts_summary[summary.account].append(summary)
             self._logger.debug(
-                f"Account summary update: {summary.account} - {summary.tag}: {summary.value}"
+                "Account summary update: %s - %s: %s", summary.account, summary.tag, summary.value
             )
 
         except Exception as e:
-            self._logger.error(f"Error handling account summary update: {e}")
+            self._logger.error("Error handling account summary update: %s", e)
 
     # ---------------------------------------
     @property
@@ -697,6 +1211,33 @@ class ezIBAsync:
         return list(self._accounts.keys())
 
     # ---------------------------------------
+    def _createTask(self, coro):
+        """
+        Schedule a background coroutine and keep a reference to it until done.
+
+        Tracked tasks are cancelled by disconnect().
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            asyncio.Task: The scheduled task
+        """
+        if self._loop is not None:
+            task = self._loop.create_task(coro)
+        else:
+            task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _onConnectedHandler(self):
+        """
+        Connection event handler for Interactive Brokers TWS/Gateway.
+
+        """
+        self.connected = True
+
     def _onDisconnectedHandler(self):
         """
         Disconnection event handler for Interactive Brokers TWS/Gateway.
@@ -706,24 +1247,70 @@ class ezIBAsync:
 
         if not self._disconnected_by_user:
             self._logger.error("Peer closed connection.")
-            asyncio.create_task(self._reconnect())
+            # a flapping link emits several disconnects; one loop handles them all
+            if self._reconnect_task is None or self._reconnect_task.done():
+                self._reconnect_task = self._createTask(self._reconnect())
+                self._reconnect_task.add_done_callback(self._onReconnectDone)
+
+    def _tuneSocket(self):
+        """
+        Disable Nagle's algorithm and enable TCP keep-alive on the IB socket.
+
+        Small order messages go out immediately instead of waiting for an
+        ACK, and a dead TWS/Gateway is noticed after ~1 minute of silence
+        rather than the OS default of hours.
+        """
+        try:
+            sock = self.ib.client.conn.transport.get_extra_info("socket")
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            # keep-alive timings are only tunable on some platforms (Linux)
+            for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+                option = getattr(socket, name, None)
+                if option is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, option, value)
+        except (AttributeError, OSError) as e:
+            self._logger.debug("Could not tune IB socket: %s", e)
+
+    def _onReconnectDone(self, task):
+        """
+        Release the reconnect slot once its loop finishes or is cancelled.
+
+        Args:
+            task: The finished reconnect task
+        """
+        if self._reconnect_task is task:
+            self._reconnect_task = None
 
-    async def _reconnect(self, reconnect_interval=2, max_attempts=300):
+    async def _reconnect(self, reconnect_interval=1, max_attempts=300, max_delay=60):
         """
         Reconnects to Interactive Brokers TWS/Gateway after a disconnection.
 
+        The first attempt is immediate; after that each delay is drawn between
+        reconnect_interval and three times the previous delay, capped at
+        max_delay ("decorrelated jitter"), so that the delays grow quickly and
+        many clients do not retry in lockstep when TWS comes back.
+
+        Args:
+            reconnect_interval: Smallest delay between attempts, in seconds
+            max_attempts: Number of attempts before giving up
+            max_delay: Upper bound for the backoff delay, in seconds
         """
         attempt = 0
+        delay = reconnect_interval
         while (
             not self.connected
             and attempt < max_attempts
             and not self._disconnected_by_user
         ):
             attempt += 1
-            self._logger.info(f"Reconnection attempt {attempt}/{max_attempts}...")
+            self._logger.info("Reconnection attempt %s/%s...", attempt, max_attempts)
 
             try:
-                await asyncio.sleep(reconnect_interval)
+                if attempt > 1:
+                    delay = min(max_delay, random.uniform(reconnect_interval, delay * 3))
+                    await asyncio.sleep(delay)
                 await self.connectAsync(
                     ibhost=self._ibhost, ibport=self._ibport, ibclient=self._ibclient
                 )
@@ -732,11 +1319,11 @@ class ezIBAsync:
                     self._logger.info("Reconnection successful")
                     break
             except Exception as e:
-                self._logger.error(f"Reconnection failed: {e}")
+                self._logger.error("Reconnection failed: %s", e)
 
         if not self.connected and attempt >= max_attempts:
             self._logger.error(
-                f"Failed to reconnect after {max_attempts} attempts, giving up"
+                "Failed to reconnect after %s attempts, giving up", max_attempts
             )
 
     # ---------------------------------------
@@ -746,12 +1333,14 @@ class ezIBAsync:
 
         """
         try:
-            # cancel all tasks
-            # tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
-            # [t.cancel() for t in tasks]
+            # cancel our background tasks (reconnect, order cleanup, cache
+            # write) in one pass; each removes itself from the set when done
+            for task in list(self._tasks):
+                task.cancel()
 
-            # # waiting for close...
-            # await asyncio.gather(*tasks, return_exceptions=True)
+            # write contract cache entries whose delayed write was cancelled
+            if self._contract_cache_dirty:
+                self._saveContractCache()
 
             # disconnect
             self._disconnected_by_user = True
@@ -762,7 +1351,7 @@ class ezIBAsync:
                 self.connected = False
                 self._logger.info("Disconnected.")
         except Exception as e:
-            self._logger.error(f"Error during disconnection: {str(e)}")
+            self._logger.error("Error during disconnection: %s", e)
 
     # ---------------------------------------
     def getAccount(self, account=None):
@@ -794,7 +1383,7 @@ class ezIBAsync:
 
         elif account not in self.accountCodes:
             self._logger.warning(
-                f"'{account}' not found in available accounts: {self.accountCodes}"
+                "'%s' not found in available accounts: %s", account, self.accountCodes
             )
             return None
             # raise ValueError("Account %s not found in account list" % account)
@@ -824,19 +1413,43 @@ class ezIBAsync:
         """
         # Handle contract object
         symbol = contract_identifier
-        if isinstance(symbol, (Contract, tuple)):
+        if isinstance(symbol, Contract):
+            # ticker id recorded by requestMarketData()
+            tickerId = self._conIdTickerIds.get(symbol.conId)
+            if tickerId is not None:
+                return tickerId
+            symbol = self.contractString(symbol)
+        elif isinstance(symbol, tuple):
             symbol = self.contractString(symbol)
 
         # Check if symbol already has a ticker ID
-        for tickerId, tickerSymbol in self.tickerIds.items():
-            if symbol == tickerSymbol:
-                return tickerId
+        tickerId = self._symbolTickerIds.get(symbol)
+        if tickerId is not None:
+            return tickerId
 
         # Assign new ticker ID
         tickerId = len(self.tickerIds)
         self.tickerIds[tickerId] = symbol
+        self._symbolTickerIds[symbol] = tickerId
         return tickerId
 
+    def _resolveTickerId(self, contract_identifier):
+        """
+        Resolve a contract, symbol, ticker ID or numeric string to a ticker ID.
+
+        Args:
+            contract_identifier: Contract object, symbol string, or ticker ID
+
+        Returns:
+            Ticker ID
+        """
+        kind = type(contract_identifier)
+        if kind is int:
+            return contract_identifier
+        if kind is str and contract_identifier.isdigit():
+            return int(contract_identifier)
+        return self.tickerId(contract_identifier)
+
     def tickerSymbol(self, tickerId):
         """
         Get the symbol for a ticker ID.
@@ -856,15 +1469,7 @@ class ezIBAsync:
         Args:
             contract: Contract object
         """
-        return (
-            contract.symbol,
-            contract.secType,
-            contract.exchange,
-            contract.currency,
-            contract.lastTradeDateOrContractMonth,
-            contract.strike,
-            contract.right,
-        )
+        return _CONTRACT_TUPLE(contract)
 
     def contractString(self, contract, separator="_"):
         """
@@ -882,13 +1487,16 @@ class ezIBAsync:
         if not isinstance(contract, tuple):
             contractTuple = self.contract_to_tuple(contract)
 
+        # keyed by value, so a contract mutated in place gets a fresh string
+        cache_key = (contractTuple, separator)
+        cached = self._contract_strings.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             if contractTuple[1] in ("OPT", "FOP"):
-                # Format strike price for options
-                strike = (
-                    "{:0>5d}".format(int(contractTuple[5]))
-                    + format(contractTuple[5], ".3f").split(".")[1]
-                )
+                # Format strike price for options as 5+3 fixed-point digits
+                strike = f"{round(contractTuple[5] * 1000):08d}"
 
                 contractString = (
                     contractTuple[0]
@@ -901,39 +1509,28 @@ class ezIBAsync:
             elif contractTuple[1] == "FUT":
                 # Format expiry for futures
                 exp = str(contractTuple[4])[:6]
-                month_codes = {
-                    1: "F",
-                    2: "G",
-                    3: "H",
-                    4: "J",
-                    5: "K",
-                    6: "M",
-                    7: "N",
-                    8: "Q",
-                    9: "U",
-                    10: "V",
-                    11: "X",
-                    12: "Z",
-                }
-                exp = month_codes[int(exp[4:6])] + exp[:4]
+                exp = MONTH_CODES[int(exp[4:6])] + exp[:4]
                 contractString = (contractTuple[0] + exp, contractTuple[1])
 
             elif contractTuple[1] == "CASH":
                 contractString = (contractTuple[0] + contractTuple[3], contractTuple[1])
 
-            else:  # STK
+            elif contractTuple[1] == "STK":
+                contractString = (contractTuple[0],)
+
+            else:
                 contractString = (contractTuple[0], contractTuple[1])
 
             # Construct string
-            contractString = separator.join(str(v) for v in contractString).replace(
-                separator + "STK", ""
-            )
+            contractString = separator.join(str(v) for v in contractString)
 
         except Exception as e:
-            self._logger.error(f"Error converting contract to string: {e}")
+            self._logger.error("Error converting contract to string: %s", e)
             contractString = contractTuple[0]
 
-        return contractString.replace(" ", "_").upper()
+        contractString = contractString.replace(" ", "_").upper()
+        self._contract_strings[cache_key] = contractString
+        return contractString
 
     # ---------------------------------------
     def contractDetails(self, contract_identifier):
@@ -946,58 +1543,15 @@ class ezIBAsync:
         Returns:
             Dictionary of contract details
         """
-        if isinstance(contract_identifier, Contract):
-            tickerId = self.tickerId(contract_identifier)
-        else:
-            if isinstance(contract_identifier, int) or (
-                isinstance(contract_identifier, str) and contract_identifier.isdigit()
-            ):
-                tickerId = int(contract_identifier)
-            else:
-                tickerId = self.tickerId(contract_identifier)
+        tickerId = self._resolveTickerId(contract_identifier)
 
         # Check if we have the contract details
         if tickerId in self.contract_details:
             return self.contract_details[tickerId]
 
-        # Default values if no details are available
-        return {
-            "tickerId": 0,
-            "category": None,
-            "contractMonth": "",
-            "downloaded": False,
-            "evMultiplier": 0,
-            "evRule": None,
-            "industry": None,
-            "liquidHours": "",
-            "longName": "",
-            "marketName": "",
-            "minTick": 0.01,
-            "orderTypes": "",
-            "priceMagnifier": 0,
-            "subcategory": None,
-            "timeZoneId": "",
-            "tradingHours": "",
-            "underConId": 0,
-            "validExchanges": "SMART",
-            "contracts": [Contract()],
-            "conId": 0,
-            "summary": {
-                "conId": 0,
-                "currency": "USD",
-                "exchange": "SMART",
-                "lastTradeDateOrContractMonth": "",
-                "includeExpired": False,
-                "localSymbol": "",
-                "multiplier": "",
-                "primaryExch": None,
-                "right": None,
-                "secType": "",
-                "strike": 0.0,
-                "symbol": "",
-                "tradingClass": "",
-            },
-        }
+        # Default values if no details are available; a fresh copy, so that
+        # callers changing the result don't change the defaults
+        return _default_contract_details()
 
     # ---------------------------------------
     async def createContract(self, *args, **kwargs):
@@ -1032,13 +1586,22 @@ class ezIBAsync:
         if "combo_legs" in kwargs:
             newContract.comboLegs = kwargs["combo_legs"]
 
-        # qualify this contract
-        qualified_contracts = await self.ib.qualifyContractsAsync(newContract)
+        # qualify this contract, from the on-disk cache when enabled
+        cacheKey = None
+        cached = None
+        if self._contract_cache_path and "combo_legs" not in kwargs:
+            cacheKey = self.contract_to_tuple(newContract) + (newContract.multiplier,)
+            cached = self._cachedContract(cacheKey)
 
-        qualified_contract = qualified_contracts[0] if qualified_contracts else None
-        if not qualified_contract:
-            self._logger.warning(f"Unknown contract: {newContract}")
-            return
+        if cached is not None:
+            qualified_contract, cached_details = cached
+        else:
+            qualified_contracts = await self.ib.qualifyContractsAsync(newContract)
+
+            qualified_contract = qualified_contracts[0] if qualified_contracts else None
+            if not qualified_contract:
+                self._logger.warning("Unknown contract: %s", newContract)
+                return
 
         contractString = self.contractString(qualified_contract)
         tickerId = self.tickerId(contractString)
@@ -1046,22 +1609,107 @@ class ezIBAsync:
         contract = self.getContract(qualified_contract)
 
         if contract:
-            self._logger.debug(f"Contract: {qualified_contract} has been registered.")
+            self._logger.debug("Contract: %s has been registered.", qualified_contract)
             return contract
 
         # Add contract to pool
         # self.contracts.append(qualified_contract)
-        self.contracts[tickerId] = qualified_contract
+        self._storeContract(tickerId, qualified_contract)
+
+        # Request contract details if not a combo contract (or already downloaded)
+        downloaded = self.contract_details.get(tickerId, {}).get("downloaded", False)
+        if "combo_legs" not in kwargs and not downloaded:
+            if cached is not None:
+                # served from the cache: no round-trip to TWS at all
+                await self._handle_contract_details(tickerId, cached_details)
+            else:
+                try:
+                    details = await self.requestContractDetails(qualified_contract)
+                    # await asyncio.sleep(1.5 if self.isMultiContract(newContract) else 0.5)
+                except KeyboardInterrupt:
+                    self._logger.warning("Contract details request interrupted")
+                else:
+                    if cacheKey is not None and details:
+                        self._contract_cache[cacheKey] = (
+                            qualified_contract, details, time.time()
+                        )
+                        self._scheduleContractCacheSave()
+
+        return qualified_contract
 
-        # Request contract details if not a combo contract
-        if "combo_legs" not in kwargs:
+    # ---------------------------------------
+    def _loadContractCache(self):
+        """
+        Load the on-disk contract cache on first use.
+
+        Returns:
+            dict: cache key -> (qualified Contract, ContractDetails list, time stored)
+        """
+        if self._contract_cache is None:
+            self._contract_cache = {}
             try:
-                await self.requestContractDetails(qualified_contract)
-                # await asyncio.sleep(1.5 if self.isMultiContract(newContract) else 0.5)
-            except KeyboardInterrupt:
-                self._logger.warning("Contract details request interrupted")
+                with open(self._contract_cache_path, "rb") as f:
+                    self._contract_cache = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self._logger.warning("Ignoring unreadable contract cache: %s", e)
 
-        return qualified_contract
+        return self._contract_cache
+
+    def _cachedContract(self, cacheKey):
+        """
+        Look up a contract in the on-disk cache.
+
+        Args:
+            cacheKey: Contract tuple plus multiplier
+
+        Returns:
+            tuple: (qualified Contract, list of ContractDetails), or None when
+            the contract is not cached or its entry is older than
+            contract_cache_ttl
+        """
+        entry = self._loadContractCache().get(cacheKey)
+        if not isinstance(entry, tuple):
+            return None
+
+        contract, details, stored_at = entry
+        if time.time() - stored_at > self._contract_cache_ttl:
+            return None
+        return contract, details
+
+    def _scheduleContractCacheSave(self, delay=1.0):
+        """
+        Mark the contract cache dirty and write it once after a short delay.
+
+        Contracts created together (e.g. an option chain) then cost a single
+        write instead of one full rewrite of the file each. disconnect()
+        writes any entries still pending.
+
+        Args:
+            delay: Seconds to wait for more entries before writing
+        """
+        self._contract_cache_dirty = True
+        if self._contract_cache_save is None or self._contract_cache_save.done():
+            self._contract_cache_save = self._createTask(self._saveContractCacheLater(delay))
+
+    async def _saveContractCacheLater(self, delay):
+        await asyncio.sleep(delay)
+        self._saveContractCache()
+
+    def _saveContractCache(self):
+        """
+        Write the contract cache to disk atomically.
+        """
+        try:
+            os.makedirs(os.path.dirname(self._contract_cache_path) or ".", exist_ok=True)
+            tmp_path = self._contract_cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._contract_cache, f)
+            os.replace(tmp_path, self._contract_cache_path)
+            self._contract_cache_dirty = False
+        except Exception as e:
+            self._logger.warning("Could not write contract cache: %s", e)
 
     # ---------------------------------------
     async def createStockContract(self, symbol, currency="USD", exchange="SMART"):
@@ -1074,7 +1722,8 @@ class ezIBAsync:
 
     # -----------------------------------------
     async def createFuturesContract(
-        self, symbol, currency="USD", expiry=None, exchange="CME", multiplier=""
+        self, symbol, currency="USD", expiry=None, exchange="CME", multiplier="",
+        concurrency=25
     ):
         """
         Create a futures contract.
@@ -1085,6 +1734,7 @@ class ezIBAsync:
             expiry: Expiry date(s) in YYYYMMDD format
             exchange: Exchange code
             multiplier: Contract multiplier
+            concurrency: Maximum number of expiries qualified at once
 
         Returns:
             Futures contract object or list of contracts
@@ -1105,17 +1755,19 @@ class ezIBAsync:
             )
             return await self.createContract(contract)
 
-        contracts = []
-        for fut_expiry in expiries:
-            contract = Future(
-                symbol=symbol,
-                lastTradeDateOrContractMonth=fut_expiry,
-                exchange=exchange,
-                currency=currency,
-                multiplier=multiplier,
-            )
-            contract = await self.createContract(contract)
-            contracts.append(contract)
+        contracts = await self._createContracts(
+            [
+                Future(
+                    symbol=symbol,
+                    lastTradeDateOrContractMonth=fut_expiry,
+                    exchange=exchange,
+                    currency=currency,
+                    multiplier=multiplier,
+                )
+                for fut_expiry in expiries
+            ],
+            concurrency,
+        )
 
         return contracts[0] if len(contracts) == 1 else contracts
 
@@ -1142,12 +1794,14 @@ class ezIBAsync:
         contract.exchange = exchange
         contfut_contract = await self.createContract(contract)
 
-        # Wait for contract details
-        for _ in range(25):
-            # await asyncio.sleep(0.01)
-            contfut = self.contract_details(contfut_contract)
-            if contfut.get("tickerId", 0) != 0 and contfut.get("conId", 0) != 0:
-                break
+        # Wait for contract details only if a request is still in flight
+        # (the contract was already being registered by another caller)
+        contfut = DEFAULT_CONTRACT_DETAILS
+        if contfut_contract is not None:
+            tickerId = self.tickerId(contfut_contract)
+            if tickerId in self._detailsEvents:
+                await self._waitContractDetails(tickerId, timeout=2)
+            contfut = self.contractDetails(tickerId)
 
         # Can't find contract? Retry once
         if contfut.get("conId", 0) == 0:
@@ -1169,8 +1823,10 @@ class ezIBAsync:
         multiplier = contfut.get("summary", {}).get("multiplier", "")
 
         # Delete continuous placeholder
-        if ticker_id in self.contracts:
-            del self.contracts[ticker_id]
+        placeholder = self.contracts.pop(ticker_id, None)
+        if placeholder is not None:
+            if self._contractsByConId.get(placeholder.conId) is placeholder:
+                del self._contractsByConId[placeholder.conId]
         if ticker_id in self.contract_details:
             del self.contract_details[ticker_id]
 
@@ -1193,6 +1849,7 @@ class ezIBAsync:
         sec_type="OPT",
         exchange="SMART",
         multiplier="",
+        concurrency=25,
     ):
         """
         Create an option contract.
@@ -1205,9 +1862,12 @@ class ezIBAsync:
             currency: Currency code
             sec_type: Security type ('OPT' or 'FOP')
             exchange: Exchange code
+            concurrency: Maximum number of contracts qualified at once
 
         Returns:
-            Option contract object or list of contracts
+            Option contract object or list of contracts. A single query with
+            no expiry or no strike returns the unqualified chain template,
+            whose contractDetails() hold every matching contract.
         """
         # Handle multiple parameters
         expiries = [expiry] if expiry and not isinstance(expiry, list) else expiry
@@ -1230,11 +1890,55 @@ class ezIBAsync:
                     # Override secType if needed (for FOP)
                     if sec_type != "OPT":
                         contract.secType = sec_type
-                    contract = await self.createContract(contract)
                     contracts.append(contract)
 
+        # A wildcard query can't be qualified; fetch the whole chain with
+        # one details request instead
+        if len(contracts) == 1 and not (contracts[0].strike and expiries):
+            return await self._createOptionChain(contracts[0])
+
+        contracts = await self._createContracts(contracts, concurrency)
+
         return contracts[0] if len(contracts) == 1 else contracts
 
+    async def _createOptionChain(self, template):
+        """
+        Register a wildcard option contract and download its whole chain.
+
+        Args:
+            template: Option contract missing its expiry and/or strike
+
+        Returns:
+            The template contract
+        """
+        tickerId = self.tickerId(template)
+        self._storeContract(tickerId, template)
+        await self.requestContractDetails(template)
+        return template
+
+    async def _createContracts(self, contracts, concurrency):
+        """
+        Create several contracts concurrently, in order.
+
+        Args:
+            contracts: Unqualified contracts
+            concurrency: Maximum number of createContract calls in flight,
+                         to stay within IB's request pacing
+
+        Returns:
+            list: Created contracts, in the order given
+        """
+        if len(contracts) == 1:
+            return [await self.createContract(contracts[0])]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create(contract):
+            async with semaphore:
+                return await self.createContract(contract)
+
+        return list(await asyncio.gather(*(create(c) for c in contracts)))
+
     async def createForexContract(self, symbol, currency="USD", exchange="IDEALPRO"):
         """
         Create a forex contract.
@@ -1285,13 +1989,15 @@ class ezIBAsync:
         """
         leg = ComboLeg()
 
-        # Get contract ID
-        loops = 0
-        con_id = 0
-        while con_id == 0 and loops < 100:
-            con_id = self.getConId(contract)
-            loops += 1
-            await asyncio.sleep(0.05)
+        # Get contract ID, waiting for (or requesting) its details if needed
+        con_id = self.getConId(contract)
+        if con_id == 0:
+            tickerId = self.tickerId(contract)
+            if tickerId in self._detailsEvents:
+                await self._waitContractDetails(tickerId, timeout=5)
+            elif tickerId not in self.contract_details:
+                await self.requestContractDetails(contract)
+            con_id = self.contractDetails(tickerId)["conId"]
 
         leg.conId = con_id
         leg.ratio = abs(ratio)
@@ -1460,21 +2166,48 @@ class ezIBAsync:
             "id": order.orderId,
             "symbol": self.contractString(contract),
             "contract": contract,
+            "trade": trade,
             "status": "SENT",
             "reason": None,
             "avgFillPrice": 0.0,
             "parentId": 0,
             # "time":         datetime.fromtimestamp(int(self.time)),
-            "account": None,
+            "account": order.account,
         }
 
-        # Record account information
-        if hasattr(order, "account"):
-            self.orders[order.orderId]["account"] = order.account
-
         # Return order ID
         return trade
 
+    # ---------------------------------------
+    async def placeOrderAsync(self, contract, order, orderId=None, account=None, timeout=5):
+        """
+        Place order on IB TWS and wait until TWS acknowledges it.
+
+        The order is sent exactly like placeOrder(); this coroutine then awaits
+        the trade's first status update (not the fill), so several orders can be
+        acknowledged concurrently with asyncio.gather().
+
+        Args:
+            contract: Contract object
+            order: Order object
+            orderId: Order ID, uses current orderId if None
+            account: Account code
+            timeout: Seconds to wait for the acknowledgement
+
+        Returns:
+            Trade object
+        """
+        trade = self.placeOrder(contract, order, orderId, account)
+
+        try:
+            await asyncio.wait_for(trade.statusEvent, timeout)
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                "Order %s not acknowledged within %ss", trade.order.orderId, timeout
+            )
+
+        return trade
+
     def cancelOrder(self, order_id):
         """
         Cancel order by order ID.
@@ -1487,7 +2220,7 @@ class ezIBAsync:
         """
         try:
             # Handle both order ID (int) and Trade object
-            if hasattr(order_id, 'order'):
+            if isinstance(order_id, Trade):
                 # It's a Trade object, get the order
                 order = order_id.order
                 trade = order_id
@@ -1501,7 +2234,6 @@ class ezIBAsync:
                 
                 if trade is None:
                     # Create a minimal Order object with just the orderId
-                    from ib_async import Order
                     order = Order()
                     order.orderId = order_id
                 else:
@@ -1522,7 +2254,7 @@ class ezIBAsync:
             return result if result else trade
             
         except Exception as e:
-            logging.error(f"Error cancelling order {order_id}: {e}")
+            self._logger.error("Error cancelling order %s: %s", order_id, e)
             return None
 
     # ---------------------------------------
@@ -1539,14 +2271,14 @@ class ezIBAsync:
             # Use ib_async's reqOpenOrdersAsync method to get open orders
             open_trades = await self.ib.reqOpenOrdersAsync()
             
-            self._logger.info(f"Retrieved {len(open_trades)} open orders from current client")
+            self._logger.info("Retrieved %s open orders from current client", len(open_trades))
             
             # Process each open trade
             for trade in open_trades:
                 self._onOpenOrderHandler(trade)
             
         except Exception as e:
-            self._logger.error(f"Error requesting open orders: {e}")
+            self._logger.error("Error requesting open orders: %s", e)
     
     # ---------------------------------------
     async def requestAllOpenOrders(self):
@@ -1559,44 +2291,88 @@ class ezIBAsync:
         try:
             self._logger.info("Requesting ALL open orders from account...")
             
-            # Use ib_async's reqAllOpenOrdersAsync method to get all orders
+            # Use ib_async's reqAllOpenOrdersAsync method to get all orders;
+            # it resolves on openOrderEnd, so no extra wait is needed
             await self.ib.reqAllOpenOrdersAsync()
             
-            # Wait for the response to be processed
-            await asyncio.sleep(2)
-            
             # Get the open trades after reqAllOpenOrders
             all_trades = self.ib.openTrades()
             
-            self._logger.info(f"Retrieved {len(all_trades)} open orders from all clients")
+            self._logger.info("Retrieved %s open orders from all clients", len(all_trades))
             
             # Process each open trade
             for trade in all_trades:
                 self._onOpenOrderHandler(trade)
             
         except Exception as e:
-            self._logger.error(f"Error requesting all open orders: {e}")
+            self._logger.error("Error requesting all open orders: %s", e)
 
     # ---------------------------------------
     async def requestContractDetails(self, contract):
         """
         Request contract details from IB API.
 
+        While the request is in flight, _detailsEvents holds an entry for the
+        contract's ticker ID, so other callers can wait for it.
+
+        Returns:
+            list of ContractDetails, or None if none were received
         """
         tickerId = self.tickerId(contract)
+        if tickerId not in self._detailsEvents:
+            self._detailsEvents[tickerId] = asyncio.Event()
+
         try:
             details = await self.ib.reqContractDetailsAsync(contract)
 
             if not details:
-                self._logger.warning(f"No contract details returned for {contract}")
+                self._logger.warning("No contract details returned for %s", contract)
                 return
 
             # self._contract_details.append(*details)
             # Process contract details
             await self._handle_contract_details(tickerId, details)
+            return details
 
         except Exception as e:
-            self._logger.error(f"Error requesting contract details: {e}")
+            self._logger.error("Error requesting contract details: %s", e)
+        finally:
+            # wake waiters even when no details came back
+            event = self._detailsEvents.pop(tickerId, None)
+            if event is not None:
+                event.set()
+
+    # -----------------------------------------
+    async def _waitContractDetails(self, tickerId, timeout):
+        """
+        Wait until contract details for a ticker ID have been stored.
+
+        Args:
+            tickerId: Ticker ID of the contract
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            bool: True if the details are available
+        """
+        if tickerId in self.contract_details:
+            return True
+
+        event = self._detailsEvents.get(tickerId)
+        created = event is None
+        if created:
+            event = self._detailsEvents[tickerId] = asyncio.Event()
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # don't leave an entry behind for lookups that never complete
+            if created and self._detailsEvents.get(tickerId) is event:
+                del self._detailsEvents[tickerId]
+
+        # the event is also set when a request returned no details
+        return tickerId in self.contract_details
 
     # -----------------------------------------
     async def _handle_contract_details(self, tickerId, details):
@@ -1640,15 +2416,22 @@ class ezIBAsync:
             # Use closest expiration as summary
             expirations = await self.getExpirations(self.contracts[tickerId])
             if expirations:
-                contract = details_dict["contracts"][-len(expirations)]
-                details_dict["summary"] = vars(contract)
+                # expirations are distinct, so look the contract up by date
+                closest = str(expirations[0])
+                contract = next(
+                    (c for c in details_dict["contracts"]
+                     if c.lastTradeDateOrContractMonth == closest),
+                    details_dict["contracts"][0],
+                )
+                details_dict["summary"] = _contract_summary(contract)
             else:
-                details_dict["summary"] = vars(details_dict["contracts"][0])
+                details_dict["summary"] = _contract_summary(details_dict["contracts"][0])
         else:
-            details_dict["summary"] = vars(details_dict["contracts"][0])
+            details_dict["summary"] = _contract_summary(details_dict["contracts"][0])
 
-        # Store contract details
+        # Store contract details, dropping sort results of the old ones
         self.contract_details[tickerId] = details_dict
+        self._sortedCache.pop(tickerId, None)
 
         # Add local symbol mapping
         for detail in details:
@@ -1659,18 +2442,35 @@ class ezIBAsync:
             ):
                 self.localSymbolExpiry[contract.localSymbol] = detail.contractMonth
 
-        # Add contracts to the contracts dictionary
-        for contract in details_dict["contracts"]:
-            contract_string = self.contractString(contract)
-            contract_ticker_id = self.tickerId(contract_string)
-            self.contracts[contract_ticker_id] = contract
+        # Add contracts to the contracts dictionary; sub-contracts get the
+        # common fields plus their own summary/contracts
+        shared = {
+            k: v for k, v in details_dict.items() if k not in ("summary", "contracts")
+        }
+        contractString, getTickerId = self.contractString, self.tickerId
+        resolved = [
+            (contract, getTickerId(contractString(contract)))
+            for contract in details_dict["contracts"]
+        ]
+        for contract, contract_ticker_id in resolved:
+            self._storeContract(contract_ticker_id, contract)
 
             # If this is a different ticker ID than the original, create a separate entry
             if contract_ticker_id != tickerId:
-                contract_details = details_dict.copy()
-                contract_details["summary"] = vars(contract)
-                contract_details["contracts"] = [contract]
-                self.contract_details[contract_ticker_id] = contract_details
+                self.contract_details[contract_ticker_id] = {
+                    **shared,
+                    "summary": _contract_summary(contract),
+                    "contracts": [contract],
+                }
+                self._sortedCache.pop(contract_ticker_id, None)
+
+            event = self._detailsEvents.pop(contract_ticker_id, None)
+            if event is not None:
+                event.set()
+
+        event = self._detailsEvents.pop(tickerId, None)
+        if event is not None:
+            event.set()
 
         # self.contract_details = self._contract_details
 
@@ -1685,11 +2485,8 @@ class ezIBAsync:
         Returns:
             Contract ID
         """
-        for c in self.contracts.values():
-            if contract.conId == c.conId:
-                return c.conId
-
-        return 0
+        registered = self._contractsByConId.get(contract.conId)
+        return 0 if registered is None else registered.conId
 
         # details = self.contractDetails(contract_identifier)
         # return details.get("conId", 0)
@@ -1705,11 +2502,20 @@ class ezIBAsync:
         Returns:
             Contract ID
         """
-        for c in self.contracts.values():
-            if contract.conId == c.conId:
-                return c
+        return self._contractsByConId.get(contract.conId)
 
-        return None
+    # -----------------------------------------
+    def _storeContract(self, tickerId, contract):
+        """
+        Add a contract to the contracts pool and the conId index.
+
+        Args:
+            tickerId: Ticker ID of the contract
+            contract: Contract object to store
+        """
+        self.contracts[tickerId] = contract
+        if contract.conId:
+            self._contractsByConId[contract.conId] = contract
 
     # -----------------------------------------
     def isMultiContract(self, contract):
@@ -1746,32 +2552,35 @@ class ezIBAsync:
 
         Args:
             contract_identifier: Contract object, symbol string, or ticker ID
-            expired: Number of expired contracts to include (0 = none)
+            expired: Number of past expirations to include (0 = none); the
+                most recent ones are kept
 
         Returns:
-            Tuple of expiration dates as integers (YYYYMMDD)
+            Sorted tuple of distinct expiration dates as integers (YYYYMMDD)
         """
-        details = self.contractDetails(contract_identifier)
-        contracts = details.get("contracts", [])
+        tickerId = self._resolveTickerId(contract_identifier)
+        contracts = self.contractDetails(tickerId).get("contracts", [])
 
         if not contracts or contracts[0].secType not in ("FUT", "FOP", "OPT"):
             return tuple()
 
-        # Collect expirations
-        expirations = []
-        for contract in contracts:
-            if contract.lastTradeDateOrContractMonth:
-                expirations.append(int(contract.lastTradeDateOrContractMonth))
+        # Distinct expirations, sorted once per details download
+        cache = self._sortedCache.setdefault(tickerId, {})
+        expirations = cache.get("expirations")
+        if expirations is None:
+            expirations = sorted({
+                int(contract.lastTradeDateOrContractMonth)
+                for contract in contracts
+                if contract.lastTradeDateOrContractMonth
+            })
+            cache["expirations"] = expirations
 
-        # Remove expired contracts
-        today = int(datetime.now().strftime("%Y%m%d"))
-        if expirations:
-            closest = min(expirations, key=lambda x: abs(x - today))
-            idx = expirations.index(closest) - expired
-            if idx >= 0:
-                expirations = expirations[idx:]
+        # Remove expired contracts, keeping the last `expired` of them
+        now = datetime.now()
+        today = now.year * 10000 + now.month * 100 + now.day
+        idx = bisect.bisect_left(expirations, today)
 
-        return tuple(sorted(expirations))
+        return tuple(expirations[max(idx - expired, 0):])
 
     # -----------------------------------------
     async def getStrikes(self, contract_identifier, smin=None, smax=None):
@@ -1784,26 +2593,26 @@ class ezIBAsync:
             smax: Maximum strike price
 
         Returns:
-            Tuple of strike prices
+            Sorted tuple of distinct strike prices
         """
-        details = self.contractDetails(contract_identifier)
-        contracts = details.get("contracts", [])
+        tickerId = self._resolveTickerId(contract_identifier)
+        contracts = self.contractDetails(tickerId).get("contracts", [])
 
         if not contracts or contracts[0].secType not in ("FOP", "OPT"):
             return tuple()
 
-        # Collect strikes
-        strikes = []
-        for contract in contracts:
-            strikes.append(contract.strike)
+        # Distinct strikes, sorted once per details download
+        cache = self._sortedCache.setdefault(tickerId, {})
+        strikes = cache.get("strikes")
+        if strikes is None:
+            strikes = sorted({contract.strike for contract in contracts})
+            cache["strikes"] = strikes
 
         # Filter by min/max
-        if smin is not None or smax is not None:
-            smin = smin if smin is not None else 0
-            smax = smax if smax is not None else float("inf")
-            strikes = [s for s in strikes if smin <= s <= smax]
+        lo = 0 if smin is None else bisect.bisect_left(strikes, smin)
+        hi = len(strikes) if smax is None else bisect.bisect_right(strikes, smax)
 
-        return tuple(sorted(strikes))
+        return tuple(strikes[lo:hi])
 
     # -----------------------------------------
     async def registerContract(self, contract):
@@ -1819,9 +2628,9 @@ class ezIBAsync:
                 # add timeout
                 await asyncio.wait_for(self.createContract(contract), timeout=10.0)
         except asyncio.TimeoutError:
-            self._logger.error(f"Contract registration timed out: {contract}")
+            self._logger.error("Contract registration timed out: %s", contract)
         except Exception as e:
-            self._logger.error(f"Error registering {contract.symbol}: {str(e)}")
+            self._logger.error("Error registering %s: %s", contract.symbol, e)
 
     # -----------------------------------------
     # Position handling
@@ -1839,7 +2648,7 @@ class ezIBAsync:
             contractString = self.contractString(contract_tuple)
 
             # try creating the contract
-            asyncio.create_task(self.registerContract(position.contract))
+            self._createTask(self.registerContract(position.contract))
             # self._logger.debug(f"Position of contract: {position.contract} updated.")
 
             # Get symbol
@@ -1866,11 +2675,12 @@ class ezIBAsync:
             # Update position
             # self._positions[position.account][contractString] = position
             self._logger.debug(
-                f"Updated position for {position.account}: {symbol} = {position.position} @ {position.avgCost}"
+                "Updated position for %s: %s = %s @ %s",
+                position.account, symbol, position.position, position.avgCost
             )
 
         except Exception as e:
-            self._logger.error(f"Error handling position update: {e}")
+            self._logger.error("Error handling position update: %s", e)
 
         # TODO:fire callback
         # self.ibCallback(caller="handlePosition", msg=position)
@@ -1898,7 +2708,7 @@ class ezIBAsync:
                 raise ValueError(
                     "Must specify account number as multiple accounts exists."
                 )
-            return self._positions[list(self._positions.keys())[0]]
+            return next(iter(self._positions.values()))
 
         if account in self._positions:
             return self._positions[account]
@@ -1950,14 +2760,15 @@ class ezIBAsync:
             # self._portfolios_items[portfolio.account].append(portfolio)
 
             self._logger.debug(
-                f"Updated portfolio for {portfolio.account}: {symbol} = {portfolio.position} @ {portfolio.marketPrice}"
+                "Updated portfolio for %s: %s = %s @ %s",
+                portfolio.account, symbol, portfolio.position, portfolio.marketPrice
             )
 
             # TODO:fire callback
             # self.ibCallback(caller="handlePortfolio", msg=portfolio)
 
         except Exception as e:
-            self._logger.error(f"Error handling portfolio update: {e}")
+            self._logger.error("Error handling portfolio update: %s", e)
 
     @property
     def portfolios(self):
@@ -2344,12 +3155,12 @@ class ezIBAsync:
                 "order": order,
                 "trade": trade,
                 "status": order_status.status if order_status else "Unknown",
-                "reason": getattr(order_status, 'whyHeld', '') if order_status else '',
+                "reason": order_status.whyHeld if order_status else '',
                 "avgFillPrice": order_status.avgFillPrice if order_status else 0.0,
                 "filled": order_status.filled if order_status else 0.0,
                 "remaining": order_status.remaining if order_status else order.totalQuantity,
-                "parentId": order.parentId if hasattr(order, 'parentId') else 0,
-                "account": getattr(order, 'account', self._default_account),
+                "parentId": order.parentId,
+                "account": order.account,
             }
             
             # Store order in symbol_orders dictionary (by symbol)
@@ -2359,12 +3170,15 @@ class ezIBAsync:
             self.symbol_orders[contract_string][order_key] = self.orders[order_key]
             
             # Register contract if not already registered
-            asyncio.create_task(self.registerContract(contract))
+            self._createTask(self.registerContract(contract))
             
-            self._logger.debug(f"Open order updated: {order.orderId} - {contract_string} - {order_status.status if order_status else 'Unknown'}")
+            self._logger.debug(
+                "Open order updated: %s - %s - %s",
+                order.orderId, contract_string, order_status.status if order_status else 'Unknown'
+            )
             
         except Exception as e:
-            self._logger.error(f"Error handling open order: {e}")
+            self._logger.error("Error handling open order: %s", e)
 
     def _onOrderStatusHandler(self, trade):
         """
@@ -2385,7 +3199,7 @@ class ezIBAsync:
             if order_key in self.orders:
                 self.orders[order_key].update({
                     "status": order_status.status,
-                    "reason": getattr(order_status, 'whyHeld', ''),
+                    "reason": order_status.whyHeld,
                     "avgFillPrice": order_status.avgFillPrice,
                     "filled": order_status.filled,
                     "remaining": order_status.remaining,
@@ -2398,12 +3212,12 @@ class ezIBAsync:
             # Remove completed orders from active tracking after a delay
             if order_status.status in ['Filled', 'Cancelled']:
                 # Keep filled/cancelled orders for a short time for reference
-                asyncio.create_task(self._cleanup_completed_order(order_key, contract_string, delay=300))  # 5 minutes
+                self._createTask(self._cleanup_completed_order(order_key, contract_string, delay=300))  # 5 minutes
             
-            self._logger.debug(f"Order status updated: {order.orderId} - {contract_string} - {order_status.status}")
+            self._logger.debug("Order status updated: %s - %s - %s", order.orderId, contract_string, order_status.status)
             
         except Exception as e:
-            self._logger.error(f"Error handling order status: {e}")
+            self._logger.error("Error handling order status: %s", e)
 
     def _onExecDetailsHandler(self, trade, fill):
         """
@@ -2423,8 +3237,11 @@ class ezIBAsync:
             
             if order_key in self.orders:
                 # Update execution information
-                current_filled = sum(f.execution.shares for f in trade.fills)
-                avg_price = sum(f.execution.price * f.execution.shares for f in trade.fills) / current_filled if current_filled > 0 else 0
+                current_filled = notional = 0
+                for f in trade.fills:
+                    current_filled += f.execution.shares
+                    notional += f.execution.price * f.execution.shares
+                avg_price = notional / current_filled if current_filled > 0 else 0
                 
                 self.orders[order_key].update({
                     "filled": current_filled,
@@ -2436,10 +3253,13 @@ class ezIBAsync:
                 if contract_string in self.symbol_orders and order_key in self.symbol_orders[contract_string]:
                     self.symbol_orders[contract_string][order_key].update(self.orders[order_key])
                 
-                self._logger.info(f"Order execution: {order.orderId} - {contract_string} - {execution.shares} shares @ {execution.price:.2f}")
+                self._logger.info(
+                    "Order execution: %s - %s - %s shares @ %.2f",
+                    order.orderId, contract_string, execution.shares, execution.price,
+                )
             
         except Exception as e:
-            self._logger.error(f"Error handling execution details: {e}")
+            self._logger.error("Error handling execution details: %s", e)
 
     def _onCommissionReportHandler(self, trade, fill, commission_report):
         """
@@ -2462,10 +3282,10 @@ class ezIBAsync:
                 if contract_string in self.symbol_orders and order.orderId in self.symbol_orders[contract_string]:
                     self.symbol_orders[contract_string][order.orderId]["commission"] = commission_report.commission
                 
-                self._logger.debug(f"Commission report: {order.orderId} - Commission: {commission_report.commission}")
+                self._logger.debug("Commission report: %s - Commission: %s", order.orderId, commission_report.commission)
             
         except Exception as e:
-            self._logger.error(f"Error handling commission report: {e}")
+            self._logger.error("Error handling commission report: %s", e)
 
     async def _cleanup_completed_order(self, order_id, contract_string, delay=300):
         """
@@ -2484,7 +3304,7 @@ class ezIBAsync:
                 status = self.orders[order_id].get("status", "Unknown")
                 if status in ['Filled', 'Cancelled']:
                     del self.orders[order_id]
-                    self._logger.debug(f"Cleaned up completed order: {order_id}")
+                    self._logger.debug("Cleaned up completed order: %s", order_id)
             
             # Remove from symbol_orders dictionary
             if contract_string in self.symbol_orders and order_id in self.symbol_orders[contract_string]:
@@ -2495,14 +3315,19 @@ class ezIBAsync:
                     del self.symbol_orders[contract_string]
                     
         except Exception as e:
-            self._logger.error(f"Error cleaning up completed order {order_id}: {e}")
+            self._logger.error("Error cleaning up completed order %s: %s", order_id, e)
 
     async def requestHistoricalData(self, contracts=None, resolution="1 min",
                                    lookback="1 D", data="TRADES", end_datetime=None, 
-                                   rth=False, csv_path=None, format_date=2):
+                                   rth=False, csv_path=None, format_date=2,
+                                   concurrency=50):
         """
         Request historical data for contracts.
         
+        Requests for multiple contracts run concurrently. IB allows at most 50
+        simultaneous historical data requests (and 60 requests per 10 minutes
+        for small bar sizes), so at most `concurrency` are in flight at once.
+        
         Args:
             contracts: Contract or list of contracts to request data for.
                       If None, uses all contracts in self.contracts.
@@ -2518,6 +3343,7 @@ class ezIBAsync:
             rth: Use regular trading hours only
             csv_path: Path to save data as CSV (optional)
             format_date: Date format (1: yyyyMMdd HH:mm:ss, 2: Unix timestamp)
+            concurrency: Maximum number of requests in flight at once
             
         Returns:
             Dict mapping contract strings to list of BarData objects, or 
@@ -2534,70 +3360,91 @@ class ezIBAsync:
         elif not isinstance(contracts, list):
             contracts = [contracts]
         
-        results = {}
+        # Expand user path (handles ~/)
+        if csv_path:
+            csv_path = os.path.expanduser(csv_path)
         
-        for contract in contracts:
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def request(contract):
             # Adjust data type for certain security types
             show = str(data).upper()
-            if hasattr(contract, 'secType'):
-                if contract.secType in ['CASH', 'FOREX', 'CFD'] and show == 'TRADES':
-                    show = 'MIDPOINT'
+            if contract.secType in ['CASH', 'FOREX', 'CFD'] and show == 'TRADES':
+                show = 'MIDPOINT'
             
             try:
                 # Request historical data using ib_async
-                bars = await self.ib.reqHistoricalDataAsync(
-                    contract,
-                    endDateTime=end_datetime,
-                    durationStr=lookback,
-                    barSizeSetting=resolution,
-                    whatToShow=show,
-                    useRTH=bool(rth),
-                    formatDate=int(format_date)
-                )
+                async with semaphore:
+                    bars = await self.ib.reqHistoricalDataAsync(
+                        contract,
+                        endDateTime=end_datetime,
+                        durationStr=lookback,
+                        barSizeSetting=resolution,
+                        whatToShow=show,
+                        useRTH=bool(rth),
+                        formatDate=int(format_date)
+                    )
                 
                 contract_string = self.contractString(contract)
-                results[contract_string] = bars
                 
                 # Save to CSV if path provided
                 if csv_path and bars:
-                    from ib_async import util
-                    import os
-                    import pandas as pd
-                    df = util.df(bars)
-                    if not df.empty:
-                        # Expand user path (handles ~/)
-                        csv_path = os.path.expanduser(csv_path)
-                        
-                        # If csv_path is a directory, create filename
-                        if os.path.isdir(csv_path):
-                            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-                            filename = os.path.join(csv_path, f"{contract_string.replace(' ', '_')}_{timestamp}.csv")
+                    # If csv_path is a directory, create filename
+                    if os.path.isdir(csv_path):
+                        timestamp = Timestamp.now().strftime('%Y%m%d_%H%M%S')
+                        filename = os.path.join(csv_path, f"{contract_string.replace(' ', '_')}_{timestamp}.csv")
+                    else:
+                        # Construct filename
+                        if len(contracts) == 1:
+                            filename = csv_path
                         else:
-                            # Construct filename
-                            if len(contracts) == 1:
-                                filename = csv_path
-                            else:
-                                # Add contract identifier to filename
-                                base, ext = os.path.splitext(csv_path)
-                                filename = f"{base}_{contract_string.replace(' ', '_')}{ext}"
-                        
-                        # Create directory if it doesn't exist
-                        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
-                        
-                        df.to_csv(filename, index=True)
-                        self._logger.info(f"Historical data saved to {filename}")
+                            # Add contract identifier to filename
+                            base, ext = os.path.splitext(csv_path)
+                            filename = f"{base}_{contract_string.replace(' ', '_')}{ext}"
+                    
+                    # Create directory if it doesn't exist
+                    os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+                    
+                    self._writeBarsCsv(bars, filename)
+                    self._logger.info("Historical data saved to %s", filename)
                 
-                self._logger.info(f"Retrieved {len(bars) if bars else 0} historical bars for {contract_string}")
+                self._logger.info(
+                    "Retrieved %s historical bars for %s", len(bars) if bars else 0, contract_string
+                )
+                return contract_string, bars
                 
             except Exception as e:
-                self._logger.error(f"Error requesting historical data for {self.contractString(contract)}: {e}")
-                results[self.contractString(contract)] = None
+                self._logger.error(
+                    "Error requesting historical data for %s: %s", self.contractString(contract), e
+                )
+                return self.contractString(contract), None
+        
+        results = dict(await asyncio.gather(*(request(contract) for contract in contracts)))
         
         # Return single result if only one contract requested
         if len(contracts) == 1:
-            return list(results.values())[0]
+            return next(iter(results.values()))
         return results
 
+    @staticmethod
+    def _writeBarsCsv(bars, filename):
+        """
+        Stream bars to a CSV file row by row, in the same layout as
+        util.df(bars).to_csv(index=True) but without building a DataFrame.
+
+        Args:
+            bars: List of BarData objects
+            filename: Destination path
+        """
+        names = [field.name for field in dataclasses.fields(bars[0])]
+        row = attrgetter(*names)
+
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["", *names])
+            for i, bar in enumerate(bars):
+                writer.writerow((i, *row(bar)))
+
     def cancelHistoricalData(self, contracts=None):
         """
         Cancel historical data requests.
@@ -2619,6 +3466,97 @@ class ezIBAsync:
                 # Note: ib_async doesn't have a direct cancelHistoricalData method
                 # since requests are handled asynchronously and complete immediately
                 contract_string = self.contractString(contract)
-                self._logger.info(f"Historical data request completed for {contract_string}")
+                self._logger.info("Historical data request completed for %s", contract_string)
             except Exception as e:
-                self._logger.error(f"Error in cancelHistoricalData for {self.contractString(contract)}: {e}")
+                self._logger.error(
+                    "Error in cancelHistoricalData for %s: %s", self.contractString(contract), e
+                )
+
+
+# ---------------------------------------------
+# connection helpers
+# ---------------------------------------------
+@asynccontextmanager
+async def session(ibhost="127.0.0.1", ibport=4001, ibclient=1, account=None, **kwargs):
+    """
+    Connect an ezIBAsync client for the duration of an ``async with`` block.
+
+    The client is disconnected on exit, including early returns and errors.
+
+    Args:
+        ibhost (str): Host address for IB connection
+        ibport (int): Port number for IB connection
+        ibclient (int): Client ID for IB connection
+        account (str, optional): Default account to use
+        **kwargs: Additional ezIBAsync arguments (e.g. contract_cache)
+
+    Returns:
+        ezIBAsync: The connected client
+
+    Raises:
+        ConnectionError: If the connection to TWS/Gateway could not be made
+    """
+    ezib = ezIBAsync(ibhost=ibhost, ibport=ibport, ibclient=ibclient, account=account, **kwargs)
+    await ezib.connectAsync()
+    if not ezib.connected:
+        ezib.disconnect()
+        raise ConnectionError(f"Could not connect to IB at {ibhost}:{ibport}")
+
+    try:
+        yield ezib
+    finally:
+        ezib.disconnect()
+
+
+_shared = {}  # (ibhost, ibport, ibclient) -> client returned by get_shared()
+_shared_lock = None
+_shared_loop = None  # event loop _shared and _shared_lock belong to
+
+
+async def get_shared(ibhost="127.0.0.1", ibport=4001, ibclient=100, account=None):
+    """
+    Get a connected ezIBAsync instance shared by every caller in the process.
+
+    There is one client per (ibhost, ibport, ibclient). The first call for an
+    endpoint connects; later calls return the same instance, reconnecting it
+    only if the connection was lost. The clients belong to the event loop they
+    were created on: call their ``disconnect()`` before that loop ends. Once the
+    loop is closed (e.g. a later ``asyncio.run()``), the next call starts a new
+    client on the current loop.
+
+    Args:
+        ibhost (str): Host address for IB connection
+        ibport (int): Port number for IB connection
+        ibclient (int): Client ID for IB connection
+        account (str, optional): Default account to use
+
+    Returns:
+        ezIBAsync: The shared, connected client
+
+    Raises:
+        ConnectionError: If the connection to TWS/Gateway could not be made
+        RuntimeError: If the shared clients belong to another event loop that
+            is still open
+    """
+    global _shared, _shared_lock, _shared_loop
+
+    loop = asyncio.get_running_loop()
+    if _shared_loop is not loop:
+        if _shared_loop is not None and not _shared_loop.is_closed():
+            raise RuntimeError("get_shared() client belongs to another running event loop")
+        _shared = {}
+        _shared_lock = asyncio.Lock()
+        _shared_loop = loop
+
+    key = (ibhost, ibport, ibclient)
+    async with _shared_lock:
+        shared = _shared.get(key)
+        if shared is None:
+            shared = _shared[key] = ezIBAsync(
+                ibhost=ibhost, ibport=ibport, ibclient=ibclient, account=account
+            )
+        if not shared.connected:
+            await shared.connectAsync(ibhost=ibhost, ibport=ibport, ibclient=ibclient, account=account)
+            if not shared.connected:
+                raise ConnectionError(f"Could not connect to IB at {ibhost}:{ibport}")
+        return shared
@@ -6,14 +6,20 @@ Common test fixtures for unit tests.
 These fixtures are optimized for fast, isolated unit tests that don't
 require external dependencies like IB Gateway/TWS.
 """
+import logging
 import pytest
 import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, Mock
 from datetime import datetime, timedelta
 
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, util
 from ib_async import Stock, Option, Future, Forex, Index, Order, Contract, Trade
 
+# Logging for the whole suite, configured once
+logging.getLogger("ib_async").setLevel("CRITICAL")
+logging.getLogger("ezib_async").setLevel("INFO")
+util.logToConsole("DEBUG")
+
 # Connection parameters
 IB_HOST = 'localhost'
 IB_PORT = 4001
@@ -36,20 +42,25 @@ def pytest_configure(config):
         "markers", "integration: marks tests as requiring IB Gateway/TWS connection"
     )
 
-@pytest_asyncio.fixture
-async def ezib_instance():
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def ib_session(request):
     """
-    Fixture that provides a connected ezIBAsync instance.
+    Connected ezIBAsync instance shared by the whole test session.
     
-    This fixture can be used by any test that needs a connected IB client.
-    It will automatically handle connection and disconnection.
+    Connecting to IB Gateway/TWS once saves a handshake per integration
+    test. Tests using it must run on the session event loop, i.e. be
+    marked with @pytest.mark.asyncio(loop_scope="session").
     """
+    # Don't wait for a connect timeout when integration tests are disabled
+    if not request.config.getoption("--run-integration"):
+        pytest.skip("Integration tests skipped (use --run-integration to run)")
+    
     # Create ezIBAsync instance
     ezib = ezIBAsync(ibhost=IB_HOST, ibport=IB_PORT, ibclient=IB_CLIENT_ID)
     
     try:
         # Connect to IB Gateway/TWS
-        connected = await ezib.connectAsync()
+        await ezib.connectAsync()
         
         if not ezib.connected:
             pytest.skip("Could not connect to IB Gateway/TWS. Skipping integration test.")
@@ -63,6 +74,21 @@ async def ezib_instance():
             ezib.disconnect()
 
 
+@pytest.fixture
+def ezib_instance(ib_session):
+    """
+    Fixture that provides a connected ezIBAsync instance.
+    
+    This fixture can be used by any test that needs a connected IB client.
+    The connection is shared across tests; market data and depth
+    subscriptions a test leaves behind are cancelled after it.
+    """
+    yield ib_session
+    
+    ib_session.cancelMarketData()
+    ib_session.cancelMarketDepth()
+
+
 # Mock Contract Fixtures
 @pytest.fixture
 def mock_stock_contract():
@@ -224,6 +250,10 @@ def create_mock_ticker(symbol="AAPL", bid=150.0, ask=150.5, last=150.25):
     ticker.bidSize = 100
     ticker.askSize = 100
     ticker.lastSize = 50
+    ticker.volume = 1000
+    ticker.impliedVolatility = float("nan")
+    ticker.callOpenInterest = float("nan")
+    ticker.putOpenInterest = float("nan")
     ticker.time = datetime.now()
     ticker.domBids = []
     ticker.domAsks = []
@@ -261,16 +291,6 @@ def create_mock_portfolio_item(symbol="AAPL", position=100, market_price=150.0,
     )
 
 
-def pytest_addoption(parser):
-    """Add command line options for test execution."""
-    parser.addoption(
-        "--run-integration",
-        action="store_true",
-        default=False,
-        help="Run integration tests that require IB Gateway/TWS"
-    )
-
-
 def pytest_collection_modifyitems(config, items):
     """
     Modify test collection to handle integration tests.
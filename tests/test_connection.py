@@ -6,6 +6,7 @@ Unit and integration tests for connection management in ezIBAsync.
 Tests connection, disconnection, reconnection, and parameter validation.
 """
 import pytest
+import socket
 import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -84,6 +85,20 @@ class TestConnectionManagement:
             # Verify no additional connection attempt
             mock_ib.connectAsync.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_connect_async_already_connected_keeps_parameters(self):
+        """Test that a redundant connect does not overwrite connection parameters."""
+        ezib = ezIBAsync(ibhost="127.0.0.1", ibport=4001, ibclient=1)
+        ezib.connected = True
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            mock_ib.connectAsync = AsyncMock()
+            
+            await ezib.connectAsync(ibhost="10.0.0.1", ibport=7497, ibclient=9)
+            
+            mock_ib.connectAsync.assert_not_called()
+            assert (ezib._ibhost, ezib._ibport, ezib._ibclient) == ("127.0.0.1", 4001, 1)
+
     def test_disconnect(self):
         """Test disconnection."""
         # Create real instance
@@ -167,6 +182,23 @@ class TestConnectionManagement:
             assert mock_connect.call_count == 3
             assert ezib.connected is False
 
+    @pytest.mark.asyncio
+    async def test_reconnect_exponential_backoff(self):
+        """Test reconnect retries immediately, then backs off with decorrelated jitter."""
+        ezib = ezIBAsync()
+        ezib.connected = False
+        ezib._disconnected_by_user = False
+        
+        # Always draw the largest allowed delay
+        with patch.object(ezib, 'connectAsync'), \
+                patch('ezib_async.ezib.asyncio.sleep', new_callable=AsyncMock) as mock_sleep, \
+                patch('ezib_async.ezib.random.uniform', side_effect=lambda lo, hi: hi) as mock_uniform:
+            await ezib._reconnect(reconnect_interval=1, max_attempts=6, max_delay=10)
+            
+            delays = [c.args[0] for c in mock_sleep.await_args_list]
+            assert delays == [3, 9, 10, 10, 10]
+            assert [c.args for c in mock_uniform.call_args_list[:3]] == [(1, 3), (1, 9), (1, 27)]
+
     @pytest.mark.asyncio
     async def test_reconnect_user_disconnected(self):
         """Test reconnection skipped when user disconnected."""
@@ -198,6 +230,59 @@ class TestConnectionManagement:
                 assert ezib.connected is False
                 mock_create_task.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_background_tasks(self):
+        """Test that disconnect cancels pending background tasks."""
+        ezib = ezIBAsync()
+        ezib.connected = False
+        
+        task = ezib._createTask(asyncio.sleep(60))
+        assert task in ezib._tasks
+        
+        ezib.disconnect()
+        await asyncio.gather(task, return_exceptions=True)
+        
+        assert task.cancelled()
+        assert not ezib._tasks
+
+    @pytest.mark.asyncio
+    async def test_repeated_disconnects_start_one_reconnect(self):
+        """Test that a burst of disconnect events runs a single reconnect loop."""
+        ezib = ezIBAsync()
+        ezib._disconnected_by_user = False
+        
+        started = asyncio.Event()
+        
+        async def fake_reconnect():
+            started.set()
+            await asyncio.sleep(60)
+        
+        with patch.object(ezib, '_reconnect', side_effect=fake_reconnect) as mock_reconnect:
+            ezib._onDisconnectedHandler()
+            ezib._onDisconnectedHandler()
+            await started.wait()
+            ezib._onDisconnectedHandler()
+            
+            assert mock_reconnect.call_count == 1
+            assert len(ezib._tasks) == 1
+            
+            task = ezib._reconnect_task
+            ezib.disconnect()
+            await asyncio.gather(task, return_exceptions=True)
+            
+            assert ezib._reconnect_task is None
+
+    def test_connected_tracks_ib_events(self):
+        """Test that connected follows ib connected/disconnected events."""
+        ezib = ezIBAsync()
+        ezib._disconnected_by_user = True
+        
+        ezib.ib.connectedEvent.emit()
+        assert ezib.connected is True
+        
+        ezib.ib.disconnectedEvent.emit()
+        assert ezib.connected is False
+
     def test_on_disconnected_handler_user_initiated(self):
         """Test disconnection handler when user initiated."""
         # Create real instance
@@ -214,6 +299,139 @@ class TestConnectionManagement:
                 assert ezib.connected is False
                 mock_create_task.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_get_shared_reuses_connection(self):
+        """Test that get_shared connects once and returns the same instance."""
+        from ezib_async import ezib as ezib_module
+
+        async def fake_connect(self, **kwargs):
+            self.connected = True
+
+        with patch.object(ezib_module, '_shared', {}), \
+                patch.object(ezib_module, '_shared_lock', None), \
+                patch.object(ezib_module, '_shared_loop', None), \
+                patch.object(ezIBAsync, 'connectAsync', autospec=True, side_effect=fake_connect) as mock_connect:
+            first = await ezib_module.get_shared(ibport=4002, ibclient=55)
+            second = await ezib_module.get_shared(ibport=4002, ibclient=55)
+
+            assert first is second
+            assert mock_connect.call_count == 1
+
+            # A dropped connection is re-established on the same instance
+            first.connected = False
+            third = await ezib_module.get_shared(ibport=4002, ibclient=55)
+            assert third is first
+            assert mock_connect.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_shared_is_per_event_loop(self):
+        """Test that get_shared starts over once its event loop is closed."""
+        from ezib_async import ezib as ezib_module
+
+        async def fake_connect(self, **kwargs):
+            self.connected = True
+
+        stale = Mock(connected=True)
+        other_loop = asyncio.new_event_loop()
+        with patch.object(ezib_module, '_shared', {("127.0.0.1", 4002, 55): stale}), \
+                patch.object(ezib_module, '_shared_lock', asyncio.Lock()), \
+                patch.object(ezib_module, '_shared_loop', other_loop), \
+                patch.object(ezIBAsync, 'connectAsync', autospec=True, side_effect=fake_connect):
+            # another loop still open: refuse to hand out its client
+            with pytest.raises(RuntimeError):
+                await ezib_module.get_shared(ibport=4002, ibclient=55)
+
+            # once that loop is closed, a new client is built on this one
+            other_loop.close()
+            shared = await ezib_module.get_shared(ibport=4002, ibclient=55)
+            assert shared is not stale
+            assert shared.connected is True
+            assert ezib_module._shared_loop is asyncio.get_running_loop()
+
+    @pytest.mark.asyncio
+    async def test_get_shared_one_client_per_endpoint(self):
+        """Test that get_shared keeps a separate client for each endpoint."""
+        from ezib_async import ezib as ezib_module
+
+        async def fake_connect(self, **kwargs):
+            self.connected = True
+
+        with patch.object(ezib_module, '_shared', {}), \
+                patch.object(ezib_module, '_shared_lock', None), \
+                patch.object(ezib_module, '_shared_loop', None), \
+                patch.object(ezIBAsync, 'connectAsync', autospec=True, side_effect=fake_connect):
+            first = await ezib_module.get_shared(ibport=4002, ibclient=55)
+            other = await ezib_module.get_shared(ibport=4002, ibclient=56)
+
+            assert other is not first
+            assert other._ibclient == 56
+            assert await ezib_module.get_shared(ibport=4002, ibclient=55) is first
+
+    @pytest.mark.asyncio
+    async def test_get_shared_raises_when_connection_fails(self):
+        """Test that get_shared raises instead of returning a disconnected client."""
+        from ezib_async import ezib as ezib_module
+
+        with patch.object(ezib_module, '_shared', {}), \
+                patch.object(ezib_module, '_shared_lock', None), \
+                patch.object(ezib_module, '_shared_loop', None), \
+                patch.object(ezIBAsync, 'connectAsync', new_callable=AsyncMock):
+            with pytest.raises(ConnectionError):
+                await ezib_module.get_shared(ibport=4002, ibclient=55)
+
+    @pytest.mark.asyncio
+    async def test_session_disconnects_on_error(self):
+        """Test that session() disconnects even when the block raises."""
+        from ezib_async import session
+
+        async def fake_connect(self, **kwargs):
+            self.connected = True
+
+        with patch.object(ezIBAsync, 'connectAsync', autospec=True, side_effect=fake_connect) as mock_connect, \
+                patch.object(ezIBAsync, 'disconnect') as mock_disconnect:
+            with pytest.raises(RuntimeError):
+                async with session(ibport=4002, ibclient=7) as ezib:
+                    assert ezib._ibport == 4002
+                    assert ezib._ibclient == 7
+                    raise RuntimeError("boom")
+
+            mock_connect.assert_called_once()
+            mock_disconnect.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_session_raises_when_connection_fails(self):
+        """Test that session() raises instead of yielding a disconnected client."""
+        from ezib_async import session
+
+        with patch.object(ezIBAsync, 'connectAsync', new_callable=AsyncMock), \
+                patch.object(ezIBAsync, 'disconnect'):
+            with pytest.raises(ConnectionError):
+                async with session(ibport=4002, ibclient=7):
+                    pytest.fail("session body ran without a connection")
+
+    def test_tune_socket_sets_nodelay_and_keepalive(self):
+        """Test the IB socket gets TCP_NODELAY and keep-alive enabled."""
+        ezib = ezIBAsync()
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock, \
+                patch.object(ezib, 'ib') as mock_ib:
+            mock_ib.client.conn.transport.get_extra_info.return_value = sock
+            
+            ezib._tuneSocket()
+            
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+
+    def test_tune_socket_without_transport(self):
+        """Test tuning is skipped quietly when there is no transport."""
+        ezib = ezIBAsync()
+        ezib.ib.client.conn.transport = None
+        
+        with patch.object(socket.socket, 'setsockopt') as mock_setsockopt:
+            ezib._tuneSocket()  # must not raise
+        
+        mock_setsockopt.assert_not_called()
+
 
 class TestConnectionIntegration:
     """Integration tests for connection management."""
@@ -14,14 +14,11 @@ import logging
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timedelta
 
-from ezib_async import ezIBAsync, util
-from ib_async import Stock, Option, Future, Forex, Index, Contract
-
-logging.getLogger("ib_async").setLevel("CRITICAL")
-logging.getLogger("ezib_async").setLevel("INFO")
+from ezib_async import ezIBAsync
+from ezib_async.ezib import DEFAULT_CONTRACT_DETAILS
+from ib_async import Stock, Option, Future, Forex, Index, Contract, ContractDetails
 
 logger = logging.getLogger('pytest.contracts')
-util.logToConsole("DEBUG")
 
 
 class TestContractCreationUnit:
@@ -72,6 +69,96 @@ class TestContractCreationUnit:
             assert result is None
             mock_ib.qualifyContractsAsync.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_create_contract_writes_through_cache(self, tmp_path):
+        """Test qualified contracts and details are persisted and reused by a new client."""
+        cache_path = str(tmp_path / "contracts.pkl")
+        qualified = Stock(symbol="AAPL", exchange="SMART", currency="USD")
+        qualified.conId = 265598
+        details = [ContractDetails(contract=qualified, minTick=0.01, longName="APPLE INC")]
+        
+        ezib = ezIBAsync(contract_cache=cache_path)
+        with patch.object(ezib, 'ib') as mock_ib:
+            mock_ib.qualifyContractsAsync = AsyncMock(return_value=[qualified])
+            mock_ib.reqContractDetailsAsync = AsyncMock(return_value=details)
+            
+            await ezib.createStockContract("AAPL")
+        ezib.disconnect()  # writes the pending cache entries
+        
+        # New client serves contract and details from disk, without TWS
+        ezib2 = ezIBAsync(contract_cache=cache_path)
+        with patch.object(ezib2, 'ib') as mock_ib:
+            mock_ib.qualifyContractsAsync = AsyncMock()
+            mock_ib.reqContractDetailsAsync = AsyncMock()
+            
+            result = await ezib2.createStockContract("AAPL")
+            
+            assert result.conId == 265598
+            assert ezib2.contractDetails(result)["longName"] == "APPLE INC"
+            mock_ib.qualifyContractsAsync.assert_not_called()
+            mock_ib.reqContractDetailsAsync.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_contract_cache_written_once_per_batch(self, tmp_path):
+        """Test contracts created together cost a single cache write."""
+        ezib = ezIBAsync(contract_cache=str(tmp_path / "contracts.pkl"))
+        stocks = []
+        for con_id, symbol in ((1, "AAPL"), (2, "MSFT"), (3, "IBM")):
+            stock = Stock(symbol=symbol, exchange="SMART", currency="USD")
+            stock.conId = con_id
+            stocks.append(stock)
+        
+        with patch.object(ezib, 'ib') as mock_ib, \
+                patch.object(ezib, '_saveContractCache') as mock_save:
+            mock_ib.qualifyContractsAsync = AsyncMock(side_effect=lambda c: [c])
+            mock_ib.reqContractDetailsAsync = AsyncMock(
+                side_effect=lambda c: [ContractDetails(contract=c)]
+            )
+            
+            await ezib._createContracts(stocks, concurrency=3)
+            mock_save.assert_not_called()
+            
+            ezib.disconnect()
+            mock_save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_cached_contract_is_qualified_again(self, tmp_path):
+        """Test cache entries older than contract_cache_ttl are not served."""
+        cache_path = str(tmp_path / "contracts.pkl")
+        cached = Stock(symbol="AAPL", exchange="SMART", currency="USD")
+        cached.conId = 1
+        current = Stock(symbol="AAPL", exchange="SMART", currency="USD")
+        current.conId = 2
+        
+        ezib = ezIBAsync(contract_cache=cache_path, contract_cache_ttl=60)
+        key = ezib.contract_to_tuple(Stock("AAPL", "SMART", "USD")) + ("",)
+        ezib._contract_cache = {key: (cached, [ContractDetails(contract=cached)], 0.0)}
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            with patch.object(ezib, 'requestContractDetails', new=AsyncMock()):
+                mock_ib.qualifyContractsAsync = AsyncMock(return_value=[current])
+                
+                result = await ezib.createStockContract("AAPL")
+        
+        assert result.conId == 2
+
+    @pytest.mark.asyncio
+    async def test_create_contract_skips_downloaded_details(self):
+        """Test details are not requested again once downloaded."""
+        ezib = ezIBAsync()
+        qualified = Stock(symbol="AAPL", exchange="SMART", currency="USD")
+        qualified.conId = 265598
+        ezib.contract_details[ezib.tickerId(qualified)] = {"downloaded": True}
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            with patch.object(ezib, 'requestContractDetails', new=AsyncMock()) as mock_request:
+                mock_ib.qualifyContractsAsync = AsyncMock(return_value=[qualified])
+                
+                result = await ezib.createStockContract("AAPL")
+        
+        assert result is qualified
+        mock_request.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_create_stock_contract_unit(self, mock_ezib):
         """Test stock contract creation (unit test)."""
@@ -156,6 +243,61 @@ class TestContractCreationUnit:
         mock_ezib.createIndexContract.assert_called_once_with("SPX")
         assert result == mock_contract
 
+    @pytest.mark.asyncio
+    async def test_create_option_chain_concurrently(self):
+        """Test option grids are created concurrently, bounded, and in order."""
+        ezib = ezIBAsync()
+        in_flight = 0
+        peak = 0
+        
+        async def fake_create(contract):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return contract
+        
+        with patch.object(ezib, 'createContract', side_effect=fake_create):
+            contracts = await ezib.createOptionContract(
+                "SPY", expiry=["20251219", "20260116"], strike=[500.0, 505.0, 510.0],
+                otype=["C", "P"], concurrency=4
+            )
+        
+        assert len(contracts) == 12
+        assert peak == 4
+        assert [(c.lastTradeDateOrContractMonth, c.strike, c.right) for c in contracts[:3]] == [
+            ("20251219", 500.0, "C"), ("20251219", 500.0, "P"), ("20251219", 505.0, "C")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_create_option_chain_with_one_request(self):
+        """Test wildcard option queries download the chain in one request."""
+        ezib = ezIBAsync()
+        details = []
+        for con_id, strike in ((1, 500.0), (2, 505.0), (3, 510.0)):
+            option = Option("SPY", "20251219", strike, "C", "SMART")
+            option.conId = con_id
+            details.append(Mock(contract=option, contractMonth="202512", minTick=0.01))
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            mock_ib.reqContractDetailsAsync = AsyncMock(return_value=details)
+            mock_ib.qualifyContractsAsync = AsyncMock()
+            
+            contract = await ezib.createOptionContract("SPY", expiry="20251219")
+        
+        mock_ib.reqContractDetailsAsync.assert_awaited_once()
+        mock_ib.qualifyContractsAsync.assert_not_called()
+        assert await ezib.getStrikes(contract) == (500.0, 505.0, 510.0)
+        assert ezib.getConId(details[1].contract) == 2
+        
+        # Chain members get the common fields and keep their own contract
+        member = ezib.contractDetails(details[1].contract)
+        assert type(member) is dict
+        assert member["contracts"] == [details[1].contract]
+        assert member["summary"]["strike"] == 505.0
+        assert member["minTick"] == 0.01
+
 
 class TestContractStringConversion:
     """Test contract string conversion functionality."""
@@ -199,6 +341,18 @@ class TestContractStringConversion:
         assert "C" in result
         assert "00500000" in result  # Strike formatted as 500.0 -> 00500000
 
+    def test_contract_string_option_fractional_strike(self):
+        """Test fractional and large strikes keep the fixed-point layout."""
+        ezib = ezIBAsync()
+        
+        # Execute
+        fractional = ezib.contractString(("SPY", "OPT", "SMART", "USD", "20251219", 512.5, "P"))
+        large = ezib.contractString(("NDX", "OPT", "SMART", "USD", "20251219", 123456.25, "C"))
+        
+        # Verify
+        assert fractional == "SPY20251219P00512500_OPT"
+        assert large == "NDX20251219C123456250_OPT"
+
     def test_contract_string_future(self, mock_future_contract):
         """Test contract string conversion for future."""
         ezib = ezIBAsync()
@@ -234,6 +388,16 @@ class TestContractStringConversion:
         result = ezib.contractString(forex_tuple)
         assert result == "EURUSD_CASH"
 
+    def test_contract_string_cached_until_contract_changes(self, mock_stock_contract):
+        """Test contract strings are memoized and follow in-place edits."""
+        ezib = ezIBAsync()
+        
+        first = ezib.contractString(mock_stock_contract)
+        assert ezib.contractString(mock_stock_contract) is first
+        
+        mock_stock_contract.symbol = "MSFT"
+        assert ezib.contractString(mock_stock_contract) == "MSFT"
+
     def test_contract_string_error_handling(self):
         """Test contract string conversion error handling."""
         ezib = ezIBAsync()
@@ -274,6 +438,31 @@ class TestTickerManagement:
         # Verify same ID is returned
         assert ticker_id1 == ticker_id2
 
+    def test_ticker_id_cached_by_con_id(self, mock_stock_contract):
+        """Test ticker ID recorded by requestMarketData skips string lookup."""
+        ezib = ezIBAsync()
+        mock_stock_contract.conId = 265598
+        ezib._conIdTickerIds[265598] = 7
+        
+        with patch.object(ezib, 'contractString') as mock_string:
+            # Execute
+            ticker_id = ezib.tickerId(mock_stock_contract)
+            
+            # Verify cached ID is used without rebuilding the string
+            assert ticker_id == 7
+            mock_string.assert_not_called()
+
+    def test_ticker_id_follows_reused_contract(self, mock_stock_contract):
+        """Test a contract object reused for another instrument gets that instrument's ID."""
+        ezib = ezIBAsync()
+        mock_stock_contract.conId = 265598
+        ezib._conIdTickerIds[265598] = ezib.tickerId("AAPL")
+        
+        mock_stock_contract.symbol = "MSFT"
+        mock_stock_contract.conId = 272093
+        
+        assert ezib.tickerId(mock_stock_contract) == ezib.tickerId("MSFT")
+
     def test_ticker_id_from_string(self):
         """Test ticker ID assignment from symbol string."""
         ezib = ezIBAsync()
@@ -326,6 +515,18 @@ class TestContractDetails:
         assert "minTick" in details
         assert details["minTick"] == 0.01  # Default
 
+    def test_contract_details_default_is_a_copy(self, mock_stock_contract):
+        """Test changing the default details does not leak into later calls."""
+        ezib = ezIBAsync()
+        
+        details = ezib.contractDetails(mock_stock_contract)
+        details["summary"]["symbol"] = "CHANGED"
+        details["contracts"].append(Contract())
+        
+        fresh = ezib.contractDetails(mock_stock_contract)
+        assert fresh["summary"]["symbol"] == ""
+        assert len(fresh["contracts"]) == 1
+
     def test_contract_details_by_ticker_id(self):
         """Test getting contract details by ticker ID."""
         ezib = ezIBAsync()
@@ -347,6 +548,120 @@ class TestContractDetails:
         # Verify
         assert isinstance(details, dict)
 
+    def test_resolve_ticker_id(self, mock_stock_contract):
+        """Test ticker ID resolution for every supported identifier type."""
+        ezib = ezIBAsync()
+        ticker_id = ezib.tickerId("AAPL")
+        
+        assert ezib._resolveTickerId(7) == 7
+        assert ezib._resolveTickerId("7") == 7
+        assert ezib._resolveTickerId("AAPL") == ticker_id
+        assert ezib._resolveTickerId(mock_stock_contract) == ezib.tickerId(mock_stock_contract)
+
+    @pytest.mark.asyncio
+    async def test_wait_contract_details_wakes_on_arrival(self):
+        """Test waiters are released as soon as contract details are stored."""
+        ezib = ezIBAsync()
+        stock = Stock("AAPL", "SMART", "USD")
+        stock.conId = 265598
+        ticker_id = ezib.tickerId(stock)
+        detail = Mock(contract=stock, contractMonth="", minTick=0.01)
+        
+        waiter = asyncio.create_task(ezib._waitContractDetails(ticker_id, timeout=5))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        await ezib._handle_contract_details(ticker_id, [detail])
+        
+        assert await waiter is True
+        assert ezib.contractDetails(ticker_id)["conId"] == 265598
+        assert ticker_id not in ezib._detailsEvents
+
+    @pytest.mark.asyncio
+    async def test_contract_details_summary_is_a_copy(self):
+        """Test the details summary holds the contract fields without aliasing it."""
+        ezib = ezIBAsync()
+        stock = Stock("AAPL", "SMART", "USD")
+        stock.conId = 265598
+        ticker_id = ezib.tickerId(stock)
+        detail = Mock(contract=stock, contractMonth="", minTick=0.01)
+        
+        await ezib._handle_contract_details(ticker_id, [detail])
+        summary = ezib.contractDetails(ticker_id)["summary"]
+        summary["symbol"] = "MSFT"
+        
+        assert set(summary) == set(DEFAULT_CONTRACT_DETAILS["summary"])
+        assert summary["conId"] == 265598
+        assert stock.symbol == "AAPL"
+
+    @pytest.mark.asyncio
+    async def test_wait_contract_details_timeout(self):
+        """Test waiting for details that never arrive times out."""
+        ezib = ezIBAsync()
+        
+        assert await ezib._waitContractDetails(42, timeout=0.01) is False
+        assert 42 not in ezib._detailsEvents
+
+    @pytest.mark.asyncio
+    async def test_continuous_futures_resolves_front_month(self):
+        """Test continuous futures use the downloaded CONTFUT details."""
+        ezib = ezIBAsync()
+        contfut = Contract(symbol="ES", secType="CONTFUT", exchange="GLOBEX")
+        ticker_id = ezib.tickerId(contfut)
+        ezib.contract_details[ticker_id] = {
+            "tickerId": ticker_id,
+            "conId": 495512563,
+            "contractMonth": "202512",
+            "summary": {"currency": "USD", "multiplier": "50"},
+        }
+        
+        with patch.object(ezib, 'createContract', AsyncMock(return_value=contfut)):
+            result = await ezib.createContinuousFuturesContract("ES", output="tuple")
+        
+        assert result == ("ES", "FUT", "GLOBEX", "USD", "202512", 0.0, "", "50")
+        assert ticker_id not in ezib.contract_details
+
+    @pytest.mark.asyncio
+    async def test_continuous_futures_without_pending_details_does_not_wait(self):
+        """Test no details wait happens when no details request is in flight."""
+        ezib = ezIBAsync()
+        contfut = Contract(symbol="ES", secType="CONTFUT", exchange="GLOBEX")
+        
+        with patch.object(ezib, 'createContract', AsyncMock(return_value=contfut)), \
+                patch.object(ezib, '_waitContractDetails', new_callable=AsyncMock) as mock_wait:
+            with pytest.raises(ValueError):
+                await ezib.createContinuousFuturesContract("ES")
+        
+        mock_wait.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_request_contract_details_wakes_waiters_without_details(self):
+        """Test waiters are released when a details request returns nothing."""
+        ezib = ezIBAsync()
+        contract = Stock(symbol="NOPE", exchange="SMART", currency="USD")
+        ticker_id = ezib.tickerId(contract)
+        
+        reply = asyncio.Event()
+        
+        async def no_details(contract):
+            await reply.wait()
+            return []
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            mock_ib.reqContractDetailsAsync = no_details
+            request = asyncio.create_task(ezib.requestContractDetails(contract))
+            await asyncio.sleep(0)
+            assert ticker_id in ezib._detailsEvents
+            
+            waiter = asyncio.create_task(ezib._waitContractDetails(ticker_id, timeout=5))
+            await asyncio.sleep(0)
+            reply.set()
+            
+            assert await waiter is False
+            await request
+        
+        assert ticker_id not in ezib._detailsEvents
+
 
 class TestMultiContractDetection:
     """Test multi-contract detection functionality."""
@@ -413,6 +728,24 @@ class TestContractHelperMethods:
         # Verify
         assert result == 12345
 
+    @pytest.mark.asyncio
+    async def test_create_combo_leg_requests_missing_details(self):
+        """Test combo legs fetch contract details once instead of polling."""
+        ezib = ezIBAsync()
+        stock = Stock("AAPL", "SMART", "USD")
+        ticker_id = ezib.tickerId(stock)
+        
+        async def fake_request(contract):
+            ezib.contract_details[ticker_id] = {"conId": 265598}
+        
+        with patch.object(ezib, 'requestContractDetails', AsyncMock(side_effect=fake_request)) as mock_request:
+            leg = await ezib.createComboLeg(stock, "BUY", ratio=-2)
+        
+        mock_request.assert_awaited_once_with(stock)
+        assert leg.conId == 265598
+        assert leg.ratio == 2
+        assert leg.exchange == "SMART"
+
     def test_get_con_id_not_found(self):
         """Test getting contract ID for non-existent contract."""
         ezib = ezIBAsync()
@@ -444,6 +777,22 @@ class TestContractHelperMethods:
         # Verify
         assert result == mock_contract
 
+    @pytest.mark.asyncio
+    async def test_get_con_id_uses_downloaded_details(self):
+        """Test contracts stored from details are found by conId."""
+        ezib = ezIBAsync()
+        stock = Stock("AAPL", "SMART", "USD")
+        stock.conId = 265598
+        detail = Mock(contract=stock, contractMonth="", minTick=0.01)
+        
+        await ezib._handle_contract_details(ezib.tickerId(stock), [detail])
+        search_contract = Mock()
+        search_contract.conId = 265598
+        
+        # Verify
+        assert ezib.getConId(search_contract) == 265598
+        assert ezib.getContract(search_contract) is stock
+
     def test_get_contract_not_found(self):
         """Test getting contract object for non-existent contract."""
         ezib = ezIBAsync()
@@ -595,13 +944,88 @@ class TestContractExpirationAndStrikes:
             # Verify filtered strikes
             assert result == (150.0, 200.0, 250.0)
 
+    @pytest.mark.asyncio
+    async def test_get_expirations_skips_expired(self):
+        """Test expirations before today are dropped unless requested."""
+        ezib = ezIBAsync()
+        
+        with patch.object(ezib, 'contractDetails') as mock_details, \
+                patch('ezib_async.ezib.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 6, 15)
+            contracts = []
+            for expiry in ("20250620", "20250516", "20250620", "20250919", "20250613"):
+                mock_contract = Mock()
+                mock_contract.secType = "FUT"
+                mock_contract.lastTradeDateOrContractMonth = expiry
+                contracts.append(mock_contract)
+            mock_details.return_value = {"contracts": contracts}
+            
+            assert await ezib.getExpirations("ES") == (20250620, 20250919)
+            assert await ezib.getExpirations("ES", expired=1) == (20250613, 20250620, 20250919)
+            assert await ezib.getExpirations("ES", expired=5) == (
+                20250516, 20250613, 20250620, 20250919
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_expirations_and_strikes_are_distinct(self):
+        """Test duplicate expirations and strikes are returned once."""
+        ezib = ezIBAsync()
+        
+        with patch.object(ezib, 'contractDetails') as mock_details, \
+                patch('ezib_async.ezib.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 6, 15)
+            contracts = []
+            for expiry, strike, right in (
+                ("20250620", 500.0, "C"), ("20250620", 500.0, "P"),
+                ("20250620", 505.0, "C"), ("20250718", 500.0, "C"),
+            ):
+                contracts.append(Option("SPY", expiry, strike, right, "SMART"))
+            mock_details.return_value = {"contracts": contracts}
+            
+            assert await ezib.getExpirations("SPY") == (20250620, 20250718)
+            assert await ezib.getStrikes("SPY") == (500.0, 505.0)
+
+    @pytest.mark.asyncio
+    async def test_get_expirations_expired_beyond_available(self):
+        """Test asking for more past expirations than exist returns them all."""
+        ezib = ezIBAsync()
+        
+        with patch.object(ezib, 'contractDetails') as mock_details, \
+                patch('ezib_async.ezib.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 6, 15)
+            contracts = []
+            for expiry in ("20250516", "20250620"):
+                mock_contract = Mock()
+                mock_contract.secType = "FUT"
+                mock_contract.lastTradeDateOrContractMonth = expiry
+                contracts.append(mock_contract)
+            mock_details.return_value = {"contracts": contracts}
+            
+            assert await ezib.getExpirations("ES", expired=10) == (20250516, 20250620)
+
+    @pytest.mark.asyncio
+    async def test_sorted_strikes_reset_by_new_details(self):
+        """Test sorted strikes are cached privately and dropped on a details refresh."""
+        ezib = ezIBAsync()
+        ticker_id = ezib.tickerId("SPY_OPT")
+        
+        first = Option("SPY", "20251219", 500.0, "C", "SMART")
+        await ezib._handle_contract_details(ticker_id, [Mock(contract=first)])
+        assert await ezib.getStrikes(ticker_id) == (500.0,)
+        assert "_sortedStrikes" not in ezib.contractDetails(ticker_id)
+        
+        second = Option("SPY", "20251219", 505.0, "C", "SMART")
+        await ezib._handle_contract_details(ticker_id, [Mock(contract=second)])
+        assert await ezib.getStrikes(ticker_id) == (505.0,)
+
 
 # Keep existing integration test class
 
+
 class TestEzIBAsyncContractsIntegration:
     """Integration tests for ezIBAsync contract functionality."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_create_stock_contract(self, ezib_instance):
         """Test creating a stock contract with real IB connection."""
         # Define test parameters for a common stock
@@ -643,7 +1067,7 @@ class TestEzIBAsyncContractsIntegration:
             logger.error(f"Error during test_create_stock_contract: {e}")
             raise
             
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_create_stock_contract_invalid(self, ezib_instance):
         """Test creating an invalid stock contract."""
         # Use a symbol that's unlikely to exist
@@ -669,7 +1093,7 @@ class TestEzIBAsyncContractsIntegration:
         
         logger.info("Invalid stock contract test completed")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_create_option_contract(self, ezib_instance):
         """Test creating an option contract."""
         # Use the third Friday of the current month as expiry date
@@ -744,7 +1168,7 @@ class TestEzIBAsyncContractsIntegration:
             logger.warning(f"Could not create or validate option contract: {e}")
             pytest.skip(f"Skipping option contract test: {e}")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_create_futures_contract(self, ezib_instance):
         """Test creating a futures contract."""
         # Try different futures symbols to increase chances of success
@@ -794,7 +1218,7 @@ class TestEzIBAsyncContractsIntegration:
         # Skip test if all attempts fail
         pytest.skip("Could not find any valid futures contracts")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_contract_to_string(self, ezib_instance):
         """Test converting contracts to strings."""
         # Create contracts
@@ -827,7 +1251,7 @@ class TestEzIBAsyncContractsIntegration:
         
         logger.info(f"Successfully verified contract string conversion for stock: {stock_str} and forex: {forex_str}")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_get_contract_details(self, ezib_instance):
         """Test retrieving contract details."""
         # Create a stock contract
@@ -844,7 +1268,7 @@ class TestEzIBAsyncContractsIntegration:
         assert "MICROSOFT" in details["longName"].upper()
         assert len(details.get("contracts", [])) >= 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_is_multi_contract(self, ezib_instance):
         """Test checking if a contract has multiple sub-contracts."""
         # Create contracts
@@ -872,7 +1296,7 @@ class TestEzIBAsyncContractsIntegration:
             logger.warning(f"Could not test futures contract: {e}")
             pytest.skip(f"Skipping multi-contract test for futures: {e}")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_get_option_strikes(self, ezib_instance):
         """Test getting strikes for an option contract."""
         try:
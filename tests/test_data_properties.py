@@ -10,11 +10,8 @@ import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 from pandas import DataFrame
 
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, TickerRing
 # Import helper functions from conftest directly
-import sys
-import os
-sys.path.insert(0, os.path.dirname(__file__))
 from conftest import create_mock_account_value, create_mock_position, create_mock_portfolio_item
 
 
@@ -393,7 +390,7 @@ class TestMarketDataProperties:
         # Verify
         assert isinstance(result, dict)
         assert 0 in result  # Default ticker ID
-        assert isinstance(result[0], DataFrame)
+        assert isinstance(result[0], TickerRing)
 
     def test_market_data_property_access(self):
         """Test accessing market data after updates."""
@@ -452,7 +449,7 @@ class TestMarketDataProperties:
         # Verify
         assert isinstance(result, dict)
         assert 0 in result  # Default ticker ID
-        assert isinstance(result[0], DataFrame)
+        assert isinstance(result[0], TickerRing)
 
     def test_options_data_property_access(self):
         """Test accessing options data after updates."""
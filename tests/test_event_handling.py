@@ -11,9 +11,6 @@ from datetime import datetime
 
 from ezib_async import ezIBAsync
 # Import helper functions from conftest directly
-import sys
-import os
-sys.path.insert(0, os.path.dirname(__file__))
 from conftest import create_mock_account_value, create_mock_position, create_mock_portfolio_item
 from ib_async import AccountValue, Position, PortfolioItem
 
@@ -93,6 +90,35 @@ class TestEventHandlerSetup:
         # Should not raise exception
         ezib._setup_handlers()
 
+    def test_register_and_unregister_handlers(self):
+        """Test registering user callbacks on IB events by name."""
+        ezib = ezIBAsync()
+        on_status = Mock()
+        on_tickers = Mock()
+        handlers = {
+            "orderStatusEvent": [on_status],
+            "pendingTickersEvent": [on_tickers],
+            "noSuchEvent": [Mock()],
+        }
+        
+        missing = ezib.registerHandlers(handlers)
+        assert missing == ["noSuchEvent"]
+        
+        # Registering the same callback again is a no-op
+        ezib.registerHandlers({"orderStatusEvent": [on_status]})
+        
+        ezib.ib.orderStatusEvent.emit("trade")
+        on_status.assert_called_once_with("trade")
+        
+        # Unknown events and callbacks are ignored
+        ezib.unregisterHandlers({"orderStatusEvent": [Mock()], "noSuchEvent": [on_status]})
+        
+        ezib.unregisterHandlers(handlers)
+        ezib.ib.orderStatusEvent.emit("trade")
+        ezib.ib.pendingTickersEvent.emit(set())
+        on_status.assert_called_once()
+        on_tickers.assert_not_called()
+
 
 class TestAccountValueEventHandling:
     """Test account value event handling."""
@@ -136,6 +162,17 @@ class TestAccountValueEventHandling:
         assert ezib._accounts["DU123456"]["ExistingTag"] == "1000.0"
         assert ezib._accounts["DU123456"]["NewTag"] == "2000.0"
 
+    def test_on_account_value_handler_sets_account_ready(self):
+        """Test first account value sets the readiness event."""
+        ezib = ezIBAsync()
+        assert not ezib.account_ready.is_set()
+        
+        # Execute
+        ezib._onAccountValueHandler(create_mock_account_value())
+        
+        # Verify readiness was signalled
+        assert ezib.account_ready.is_set()
+
     def test_on_account_value_handler_error_handling(self):
         """Test account value handler error handling."""
         ezib = ezIBAsync()
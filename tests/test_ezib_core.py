@@ -11,7 +11,7 @@ from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime
 from pandas import DataFrame
 
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, TickerRing
 from ib_async import Stock, IB
 
 
@@ -56,6 +56,57 @@ class TestEzIBAsyncInitialization:
         assert ezib._ibclient == 123
         assert ezib._default_account == "DU123456"
 
+    def test_init_reuses_given_ib_instance(self):
+        """Test that an existing IB instance is used and wired to the handlers."""
+        from ib_async import IB
+        ib = IB()
+        
+        ezib = ezIBAsync(ib=ib)
+        
+        assert ezib.ib is ib
+        ib.connectedEvent.emit()
+        assert ezib.connected is True
+
+    @pytest.mark.asyncio
+    async def test_init_adopts_connected_ib_instance(self):
+        """Test that a connected IB instance is used without reconnecting."""
+        ib = IB()
+        
+        with patch.object(ib, 'isConnected', return_value=True), \
+             patch.object(ib, 'connectAsync', new_callable=AsyncMock) as mock_connect, \
+             patch.object(ib, 'openTrades', return_value=[Mock()]), \
+             patch.object(ezIBAsync, '_onOpenOrderHandler'):
+            ezib = ezIBAsync(ib=ib, account="DU123456")
+            ezib._accounts = {"DU123456": {}}
+            
+            assert ezib.connected is True
+            await ezib.connectAsync()
+            
+            mock_connect.assert_not_called()
+            assert ezib.connected is True
+
+    def test_init_detaches_previous_wrapper(self):
+        """Test that only the newest wrapper of an IB instance handles its events."""
+        ib = IB()
+        old = ezIBAsync(ib=ib)
+        new = ezIBAsync(ib=ib)
+        
+        ib.connectedEvent.emit()
+        
+        assert new.connected is True
+        assert old.connected is False
+        assert old._disconnected_by_user is True
+
+    def test_from_pool_reuses_ib_per_endpoint(self):
+        """Test that from_pool shares one IB instance per endpoint."""
+        first = ezIBAsync.from_pool(ibport=4002, ibclient=31)
+        second = ezIBAsync.from_pool(ibport=4002, ibclient=31)
+        other = ezIBAsync.from_pool(ibport=4002, ibclient=32)
+        
+        assert second.ib is first.ib
+        assert other.ib is not first.ib
+        assert second._ibclient == 31
+
     def test_init_python_version_check(self):
         """Test Python version requirement check."""
         # Version check happens at module level, so we test the logic directly
@@ -132,11 +183,11 @@ class TestEzIBAsyncInitialization:
         
         # Verify market data structures have default ticker
         assert 0 in ezib.marketData
-        assert isinstance(ezib.marketData[0], DataFrame)
+        assert isinstance(ezib.marketData[0], TickerRing)
         assert 0 in ezib.marketDepthData
         assert isinstance(ezib.marketDepthData[0], DataFrame)
         assert 0 in ezib.optionsData
-        assert isinstance(ezib.optionsData[0], DataFrame)
+        assert isinstance(ezib.optionsData[0], TickerRing)
         
         # Verify ticker ID mapping
         assert 0 in ezib.tickerIds
@@ -307,6 +358,15 @@ class TestTickerManagement:
         # Should return same ID
         assert ticker_id1 == ticker_id2
 
+    def test_ticker_id_reverse_index_in_sync(self):
+        """Test the symbol -> ticker ID index mirrors tickerIds."""
+        ezib = ezIBAsync()
+        
+        for symbol in ("AAPL", "MSFT", "AAPL", "ES"):
+            ezib.tickerId(symbol)
+        
+        assert ezib._symbolTickerIds == {v: k for k, v in ezib.tickerIds.items()}
+
     def test_ticker_id_with_contract_object(self):
         """Test ticker ID with contract object."""
         ezib = ezIBAsync()
@@ -393,12 +453,13 @@ class TestDataStructureManagement:
         assert ezib.orders[1001] == order_info
 
     def test_market_data_dataframe_initialization(self):
-        """Test market data DataFrame initialization."""
+        """Test market data store initialization."""
         ezib = ezIBAsync()
         
-        # Check default ticker DataFrame
-        default_df = ezib.marketData[0]
-        assert isinstance(default_df, DataFrame)
+        # Check default ticker template
+        default_ring = ezib.marketData[0]
+        assert isinstance(default_ring, TickerRing)
+        assert len(default_ring) == 0
         
         # Add new ticker data
         test_df = DataFrame({"bid": [150.0], "ask": [150.5]})
@@ -530,6 +591,33 @@ class TestStaticMethods:
         assert result[0] == "AAPL"
 
 
+class TestRunHelper:
+    """Test the package-level run() helper."""
+
+    def test_run_returns_coroutine_result(self):
+        """Test run() drives a coroutine to completion."""
+        import ezib_async
+
+        async def main():
+            return 42
+
+        assert ezib_async.run(main()) == 42
+
+    def test_run_falls_back_without_uvloop(self):
+        """Test run() uses asyncio.run when uvloop is not installed."""
+        import ezib_async
+
+        async def main():
+            return "done"
+
+        with patch.dict(sys.modules, {"uvloop": None}):
+            with patch("asyncio.run", return_value="done") as mock_run:
+                coro = main()
+                assert ezib_async.run(coro) == "done"
+                mock_run.assert_called_once_with(coro)
+                coro.close()
+
+
 class TestSpecialFeatures:
     """Test special features and advanced functionality."""
 
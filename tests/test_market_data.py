@@ -7,14 +7,13 @@ Tests market data requests, cancellation, depth data, and event handling.
 """
 import pytest
 import asyncio
+import numpy as np
 from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
 
-from ezib_async import ezIBAsync
+from ezib_async import ezIBAsync, TickerRing
+from ib_async import BarData, util
 # Import helper functions from conftest directly
-import sys
-import os
-sys.path.insert(0, os.path.dirname(__file__))
 from conftest import create_mock_ticker
 
 
@@ -109,6 +108,26 @@ class TestMarketDataRequests:
                         # Verify rate limiting sleep was called
                         mock_sleep.assert_called_once_with(0.0021)
 
+    @pytest.mark.asyncio
+    async def test_request_market_data_returns_ready_events(self):
+        """Test market data request returns a per-ticker readiness event."""
+        # Create real instance
+        ezib = ezIBAsync()
+        
+        with patch.object(ezib, 'ib'):
+            with patch.object(ezib, 'isMultiContract', return_value=False):
+                with patch.object(ezib, 'contractString', return_value="AAPL"):
+                    contract = Mock()
+                    
+                    # Execute
+                    ready = await ezib.requestMarketData([contract])
+                    
+                    # Verify event is registered but not yet set
+                    ticker_id = ezib.tickerId("AAPL")
+                    assert ezib._conIdTickerIds[contract.conId] == ticker_id
+                    assert ready[ticker_id] is ezib.market_ready[ticker_id]
+                    assert not ready[ticker_id].is_set()
+
     def test_cancel_market_data_single_contract(self, mock_ezib, mock_stock_contract):
         """Test canceling market data for a single contract."""
         # Setup
@@ -146,6 +165,38 @@ class TestMarketDataRequests:
         # Verify
         mock_ezib.cancelMarketData.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_subscribe_cancels_on_exit(self, mock_stock_contract):
+        """Test that subscribe() cancels market data when the block exits."""
+        ezib = ezIBAsync()
+        ready = {1: asyncio.Event()}
+        
+        with patch.object(ezib, 'requestMarketData', AsyncMock(return_value=ready)) as mock_request, \
+                patch.object(ezib, 'cancelMarketData') as mock_cancel:
+            with pytest.raises(RuntimeError):
+                async with ezib.subscribe([mock_stock_contract]) as events:
+                    assert events is ready
+                    mock_cancel.assert_not_called()
+                    raise RuntimeError("boom")
+            
+            mock_request.assert_awaited_once_with([mock_stock_contract], snapshot=False)
+            mock_cancel.assert_called_once_with([mock_stock_contract])
+
+    @pytest.mark.asyncio
+    async def test_snapshot_returns_quotes_by_contract_string(self, mock_stock_contract):
+        """Test that snapshot() returns one quote per contract."""
+        ezib = ezIBAsync()
+        ticker = create_mock_ticker(bid=150.0, ask=150.1, last=150.05)
+        ticker.contract = mock_stock_contract
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            mock_ib.reqTickersAsync = AsyncMock(return_value=[ticker])
+            
+            quotes = await ezib.snapshot(mock_stock_contract)
+            
+            mock_ib.reqTickersAsync.assert_awaited_once_with(mock_stock_contract)
+            assert quotes == {"AAPL": {"bid": 150.0, "ask": 150.1, "last": 150.05}}
+
 
 class TestMarketDepthRequests:
     """Test market depth (Level II) functionality."""
@@ -301,6 +352,23 @@ class TestMarketDataEventHandling:
                     mock_options_emit.assert_called_once()
                     mock_depth_emit.assert_called_once()
 
+    def test_on_pending_tickers_handler_sets_market_ready(self):
+        """Test first tick sets the ticker readiness event."""
+        # Create real instance
+        ezib = ezIBAsync()
+        
+        ticker = create_mock_ticker("AAPL")
+        
+        with patch.object(ezib, 'contractString', return_value="AAPL"):
+            ticker_id = ezib.tickerId("AAPL")
+            ezib.market_ready[ticker_id] = asyncio.Event()
+            
+            # Execute
+            ezib._onPendingTickersHandler([ticker])
+            
+            # Verify readiness was signalled
+            assert ezib.market_ready[ticker_id].is_set()
+
     def test_handle_orderbook_update(self):
         """Test orderbook update handling."""
         # Create real instance
@@ -317,6 +385,181 @@ class TestMarketDataEventHandling:
             mock_emit.assert_called_once_with(mock_ticker)
 
 
+class TestTickerRing:
+    """Test the per-ticker tick history buffer."""
+
+    def test_push_and_latest(self):
+        """Test latest() returns the most recent tick."""
+        ring = TickerRing(("bid", "ask"), capacity=4)
+        
+        ring.push(datetime(2025, 1, 2, 15, 30), bid=150.0, ask=150.5)
+        ring.push(datetime(2025, 1, 2, 15, 31), bid=151.0, ask=151.5)
+        
+        latest = ring.latest()
+        assert len(ring) == 2
+        assert latest.bid == 151.0
+        assert latest.ask == 151.5
+
+    def test_push_carries_forward_missing_fields(self):
+        """Test fields not given are carried over from the previous tick."""
+        ring = TickerRing(("bid", "ask"), capacity=4)
+        
+        ring.push(datetime.now(), bid=150.0, ask=150.5)
+        ring.push(datetime.now(), bid=151.0)
+        
+        assert ring.latest().ask == 150.5
+
+    def test_latest_empty(self):
+        """Test latest() on an empty buffer returns NaN fields."""
+        ring = TickerRing(("bid",))
+        
+        latest = ring.latest()
+        assert latest.datetime is None
+        assert latest.bid != latest.bid  # NaN
+
+    def test_wraps_at_capacity(self):
+        """Test oldest ticks are overwritten once capacity is reached."""
+        ring = TickerRing(("last",), capacity=3)
+        
+        for price in (1.0, 2.0, 3.0, 4.0, 5.0):
+            ring.push(datetime.now(), last=price)
+        
+        assert len(ring) == 3
+        assert list(ring["last"]) == [3.0, 4.0, 5.0]
+
+    def test_to_df(self):
+        """Test to_df() builds a datetime-indexed DataFrame oldest first."""
+        ring = TickerRing(("bid", "ask"), capacity=4)
+        ring.push(datetime(2025, 1, 2, 15, 30), bid=150.0, ask=150.5)
+        ring.push(datetime(2025, 1, 2, 15, 31), bid=151.0, ask=151.5)
+        
+        df = ring.to_df()
+        assert list(df.columns) == ["bid", "ask"]
+        assert list(df["bid"]) == [150.0, 151.0]
+        assert df.index.name == "datetime"
+
+    def test_fixed_point_prices_and_float_sizes(self):
+        """Test prices are quantized and sizes kept as float64."""
+        ring = TickerRing(
+            ("bid", "bidsize", "iv"),
+            fixed={"bid": TickerRing.PRICE_SCALE},
+            sizes=("bidsize",),
+        )
+        
+        ring.push(datetime.now(), bid=1.08345, bidsize=1500, iv=0.2)
+        
+        assert ring.columns["bid"].dtype == np.int64
+        assert ring.columns["bidsize"].dtype == np.float64
+        latest = ring.latest()
+        assert latest.bid == 1.08345  # no float32 rounding on FX prices
+        assert latest.bidsize == 1500.0
+        assert list(ring["bid"]) == [1.08345]
+
+    def test_fractional_sizes_round_trip(self):
+        """Test fractional sizes and volume are not truncated."""
+        ring = TickerRing(
+            ("bidsize", "volume"),
+            sizes=("bidsize", "volume"),
+        )
+        
+        ring.push(datetime.now(), bidsize=0.25, volume=1234.5678)
+        
+        latest = ring.latest()
+        assert latest.bidsize == 0.25
+        assert latest.volume == 1234.5678
+
+    def test_fixed_point_missing_values_read_as_nan(self):
+        """Test missing prices and sizes round-trip as NaN."""
+        ring = TickerRing(
+            ("bid", "bidsize"),
+            fixed={"bid": TickerRing.PRICE_SCALE},
+            sizes=("bidsize",),
+        )
+        
+        ring.push(datetime.now(), bid=float("nan"), bidsize=None)
+        
+        latest = ring.latest()
+        assert np.isnan(latest.bid)
+        assert np.isnan(latest.bidsize)
+        assert np.isnan(ring.to_df()["bid"].iloc[0])
+
+    def test_copy_is_independent(self):
+        """Test copy() does not share storage with the original."""
+        ring = TickerRing(("bid",), capacity=4)
+        clone = ring.copy()
+        
+        clone.push(datetime.now(), bid=1.0)
+        
+        assert len(ring) == 0
+        assert len(clone) == 1
+
+    def test_allocates_on_first_tick(self):
+        """Test storage is only allocated once the first tick arrives."""
+        ring = TickerRing(("bid",), capacity=4)
+        
+        assert ring.columns == {}
+        assert len(ring["bid"]) == 0
+        assert ring.to_df().empty
+        
+        ring.push(datetime.now(), bid=1.0)
+        
+        assert len(ring.columns["bid"]) == 4
+
+    def test_tick_history_sets_ring_capacity(self):
+        """Test tick_history bounds the per-ticker buffers."""
+        ezib = ezIBAsync(tick_history=2)
+        
+        ticker = create_mock_ticker("AAPL", bid=150.0, ask=150.5, last=150.25)
+        
+        with patch.object(ezib, 'contractString', return_value="AAPL"):
+            for _ in range(3):
+                ezib._onPendingTickersHandler([ticker])
+            
+            ring = ezib.marketData[ezib.tickerId("AAPL")]
+            assert ring.capacity == 2
+            assert len(ring) == 2
+            assert ezib.marketData[0].columns == {}  # template never allocated
+
+    def test_pending_tickers_handler_records_ticks(self):
+        """Test the tick handler appends ticks to the ticker's buffer."""
+        ezib = ezIBAsync()
+        
+        ticker = create_mock_ticker("AAPL", bid=150.0, ask=150.5, last=150.25)
+        
+        with patch.object(ezib, 'contractString', return_value="AAPL"):
+            ezib._onPendingTickersHandler([ticker])
+            ezib._onPendingTickersHandler([ticker])
+            
+            ticker_id = ezib.tickerId("AAPL")
+            latest = ezib.marketData[ticker_id].latest()
+            
+            assert len(ezib.marketData[ticker_id]) == 2
+            assert latest.bid == 150.0
+            assert latest.last == 150.25
+            assert len(ezib.marketData[0]) == 0  # template untouched
+
+    def test_option_computation_updates_latest_tick(self):
+        """Test option greeks are written to the latest tick."""
+        ezib = ezIBAsync()
+        ring = ezib.optionsData[0].copy()
+        ring.push(datetime.now(), bid=5.0, ask=5.5)
+        ezib.optionsData[1] = ring
+        
+        computation = Mock(
+            impliedVol=0.25, pvDividend=0.0, delta=0.5, gamma=0.1,
+            vega=0.2, theta=-0.05, optPrice=5.25, undPrice=150.0
+        )
+        
+        # Execute
+        ezib._handleTickOptionComputation(1, computation, "last_")
+        
+        # Verify
+        latest = ring.latest()
+        assert latest.last_delta == 0.5
+        assert latest.delta == 0.5
+        assert latest.underlying == 150.0
+
+
 class TestMarketDataProperties:
     """Test market data property access."""
 
@@ -356,11 +599,69 @@ class TestMarketDataProperties:
         assert result == {1: mock_options_data}
 
 
+class TestHistoricalData:
+    """Test historical data requests."""
+
+    @pytest.mark.asyncio
+    async def test_request_historical_data_writes_csv(self, tmp_path):
+        """Test bars are streamed to CSV in util.df().to_csv() layout."""
+        ezib = ezIBAsync()
+        bars = [
+            BarData(date=datetime(2025, 1, 2, 15, 30), open=150.0, high=151.0,
+                    low=149.5, close=150.5, volume=1000.0, average=150.2, barCount=12),
+            BarData(date=datetime(2025, 1, 2, 15, 31), open=150.5, high=152.0,
+                    low=150.0, close=151.5, volume=800.0, average=151.0, barCount=9),
+        ]
+        csv_path = tmp_path / "bars.csv"
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            with patch.object(ezib, 'contractString', return_value="AAPL"):
+                mock_ib.reqHistoricalDataAsync = AsyncMock(return_value=bars)
+                
+                # Execute
+                result = await ezib.requestHistoricalData(Mock(), csv_path=str(csv_path))
+        
+        # Verify
+        assert result == bars
+        expected = util.df(bars).to_csv(index=True)
+        with open(csv_path, newline="") as f:
+            assert f.read() == expected
+
+    @pytest.mark.asyncio
+    async def test_request_historical_data_bounded_concurrency(self):
+        """Test multi-contract requests overlap up to the concurrency limit."""
+        ezib = ezIBAsync()
+        in_flight = 0
+        peak = 0
+        
+        async def fake_request(contract, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [contract.symbol]
+        
+        contracts = [Mock(symbol=f"SYM{i}", secType="STK") for i in range(5)]
+        
+        with patch.object(ezib, 'ib') as mock_ib:
+            with patch.object(ezib, 'contractString', side_effect=lambda c: c.symbol):
+                mock_ib.reqHistoricalDataAsync = fake_request
+                
+                # Execute
+                results = await ezib.requestHistoricalData(contracts, concurrency=2)
+        
+        # Verify
+        assert peak == 2
+        assert list(results) == [c.symbol for c in contracts]
+        assert results["SYM3"] == ["SYM3"]
+
+
 class TestMarketDataIntegration:
     """Integration tests for market data functionality."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_real_market_data_request(self, ezib_instance):
         """Test real market data request with IB connection."""
         # Create a simple stock contract
@@ -379,14 +680,14 @@ class TestMarketDataIntegration:
             
             # Check if we got any data (market may be closed)
             market_data = ezib_instance.marketData[ticker_id]
-            assert isinstance(market_data, dict)
+            assert isinstance(market_data, TickerRing)
             
         finally:
             # Always cancel market data
             ezib_instance.cancelMarketData([contract])
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_real_market_depth_request(self, ezib_instance):
         """Test real market depth request with IB connection."""
         # Create a liquid stock contract
@@ -412,7 +713,7 @@ class TestMarketDataIntegration:
             ezib_instance.cancelMarketDepth([contract])
 
     @pytest.mark.integration  
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_real_streaming_market_data(self, ezib_instance):
         """Test real streaming market data with event handling."""
         # Create contract
@@ -420,9 +721,11 @@ class TestMarketDataIntegration:
         
         # Event handler to capture data
         received_events = []
+        first_event = asyncio.Event()
         
         def market_data_handler(tickers):
             received_events.extend(tickers)
+            first_event.set()
         
         try:
             # Subscribe to market data events
@@ -431,8 +734,11 @@ class TestMarketDataIntegration:
             # Request streaming market data
             await ezib_instance.requestMarketData([contract], snapshot=False)
             
-            # Wait for some streaming updates
-            await asyncio.sleep(5)
+            # Wait (at most 5s) for the first streaming update
+            try:
+                await asyncio.wait_for(first_event.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
             
             # Verify we received some events (if market is open)
             # Note: This may be 0 if market is closed
@@ -6,6 +6,7 @@ Unit and integration tests for order management functionality in ezIBAsync.
 Tests order creation, placement, bracket orders, and order lifecycle management.
 """
 import pytest
+import asyncio
 import time
 from unittest.mock import Mock, patch
 from datetime import datetime
@@ -234,6 +235,43 @@ class TestOrderPlacement:
                     assert order_info["id"] == 1001
                     assert order_info["symbol"] == "AAPL"
                     assert order_info["status"] == "SENT"
+                    assert order_info["trade"] is mock_trade
+
+    @pytest.mark.asyncio
+    async def test_place_order_async_waits_for_acknowledgement(self):
+        """Test async order placement returns once TWS acknowledges the order."""
+        # Create real instance
+        ezib = ezIBAsync()
+        order = Order(orderId=1001)
+        trade = Trade(order=order)
+
+        with patch.object(ezib, 'placeOrder', return_value=trade) as mock_place:
+            # Simulate TWS status update arriving after submission
+            asyncio.get_running_loop().call_soon(trade.statusEvent.emit, trade)
+
+            # Execute
+            result = await ezib.placeOrderAsync(Mock(), order, timeout=1)
+
+            # Verify
+            assert result is trade
+            mock_place.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_place_order_async_timeout(self):
+        """Test async order placement returns the trade when no ack arrives."""
+        # Create real instance
+        ezib = ezIBAsync()
+        order = Order(orderId=1001)
+        trade = Trade(order=order)
+
+        with patch.object(ezib, 'placeOrder', return_value=trade):
+            with patch.object(ezib, '_logger') as mock_logger:
+                # Execute
+                result = await ezib.placeOrderAsync(Mock(), order, timeout=0.01)
+
+                # Verify
+                assert result is trade
+                mock_logger.warning.assert_called_once()
 
 
 class TestTargetOrders:
@@ -544,12 +582,19 @@ class TestRoundClosestValid:
         result = ezIBAsync.roundClosestValid(150.123456, res=0.001, decimals=3)
         assert result == 150.123
 
+    def test_offset_price_bps(self):
+        """Test basis-point price offsets land on valid ticks."""
+        assert ezIBAsync.offsetPrice(150.0, 200) == 153.0
+        assert ezIBAsync.offsetPrice(150.0, -100) == 148.5
+        assert ezIBAsync.offsetPrice(187.37, 200) == 191.12
+        assert ezIBAsync.offsetPrice(4501.25, 50, res=0.25) == 4523.75
+
 
 class TestOrderIntegration:
     """Integration tests for order functionality."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_real_order_creation_and_placement(self, ezib_instance):
         """Test real order creation and placement (paper trading only)."""
         # Create contract
@@ -570,7 +615,7 @@ class TestOrderIntegration:
         assert limit_order.lmtPrice == 100.0
 
     @pytest.mark.integration
-    @pytest.mark.asyncio 
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_real_bracket_order_creation(self, ezib_instance):
         """Test real bracket order creation structure."""
         # Create contract
@@ -14,9 +14,6 @@ from datetime import datetime, timedelta
 from ezib_async import ezIBAsync
 
 
-# Set up logging for integration tests
-logging.getLogger("ib_async").setLevel("CRITICAL")
-logging.getLogger("ezib_async").setLevel("INFO")
 logger = logging.getLogger('pytest.integration_full')
 
 
@@ -24,7 +21,7 @@ class TestFullWorkflowIntegration:
     """Test complete workflows end-to-end."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_complete_stock_workflow(self, ezib_instance):
         """Test complete stock trading workflow."""
         logger.info("Starting complete stock workflow test")
@@ -86,7 +83,7 @@ class TestFullWorkflowIntegration:
             raise
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_multi_contract_workflow(self, ezib_instance):
         """Test workflow with multiple contract types."""
         logger.info("Starting multi-contract workflow test")
@@ -150,7 +147,7 @@ class TestFullWorkflowIntegration:
             raise
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_market_depth_workflow(self, ezib_instance):
         """Test market depth (Level II) workflow."""
         logger.info("Starting market depth workflow test")
@@ -187,7 +184,7 @@ class TestFullWorkflowIntegration:
             raise
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_options_workflow(self, ezib_instance):
         """Test options contract workflow."""
         logger.info("Starting options workflow test")
@@ -241,7 +238,7 @@ class TestFullWorkflowIntegration:
             raise
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_bracket_order_creation_workflow(self, ezib_instance):
         """Test bracket order creation workflow (without actual placement)."""
         logger.info("Starting bracket order creation workflow test")
@@ -259,13 +256,10 @@ class TestFullWorkflowIntegration:
             ticker_id = ezib_instance.tickerId(contract)
             market_data = ezib_instance.marketData.get(ticker_id)
             
-            if market_data is not None and not market_data.empty:
+            if market_data is not None and len(market_data) > 0:
                 # Use market data to set realistic prices
-                last_price = market_data.get('last', [150.0])
-                if hasattr(last_price, '__iter__') and len(last_price) > 0:
-                    base_price = float(last_price[0]) if last_price[0] else 150.0
-                else:
-                    base_price = 150.0
+                last_price = market_data.latest().last
+                base_price = last_price if last_price > 0 else 150.0
             else:
                 base_price = 150.0  # Fallback price
             
@@ -316,16 +310,18 @@ class TestEventDrivenWorkflow:
     """Test event-driven workflows."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_real_time_data_events(self, ezib_instance):
         """Test real-time data event handling."""
         logger.info("Starting real-time data events test")
         
         # Event tracking
         market_events_received = []
+        first_event = asyncio.Event()
         
         def market_data_handler(tickers):
             market_events_received.extend(tickers)
+            first_event.set()
             logger.info(f"Received market data event for {len(tickers)} tickers")
         
         try:
@@ -341,9 +337,12 @@ class TestEventDrivenWorkflow:
             await ezib_instance.requestMarketData([contract], snapshot=False)
             logger.info("✓ Requested streaming market data")
             
-            # Wait for events
+            # Wait for the first event (at most 10s; none arrive when the market is closed)
             logger.info("Waiting for real-time events...")
-            await asyncio.sleep(10)
+            try:
+                await asyncio.wait_for(first_event.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                pass
             
             # Check if events were received
             if len(market_events_received) > 0:
@@ -363,14 +362,24 @@ class TestEventDrivenWorkflow:
         logger.info("✅ Real-time data events test completed")
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_account_updates_events(self, ezib_instance):
         """Test account update events."""
         logger.info("Starting account updates events test")
         
+        account_updated = asyncio.Event()
+        
+        def account_value_handler(value):
+            account_updated.set()
+        
+        ezib_instance.ib.accountValueEvent += account_value_handler
         try:
-            # Wait a moment for account data to populate
-            await asyncio.sleep(3)
+            # Wait (at most 3s) for account data to populate
+            if not ezib_instance.accounts:
+                try:
+                    await asyncio.wait_for(account_updated.wait(), timeout=3)
+                except asyncio.TimeoutError:
+                    pass
             
             # Check initial account data
             initial_accounts = ezib_instance.accounts
@@ -399,13 +408,15 @@ class TestEventDrivenWorkflow:
         except Exception as e:
             logger.error(f"❌ Account updates events test failed: {e}")
             raise
+        finally:
+            ezib_instance.ib.accountValueEvent -= account_value_handler
 
 
 class TestErrorRecoveryIntegration:
     """Test error recovery in integration scenarios."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_invalid_contract_recovery(self, ezib_instance):
         """Test recovery from invalid contract requests."""
         logger.info("Starting invalid contract recovery test")
@@ -435,7 +446,7 @@ class TestErrorRecoveryIntegration:
             raise
 
     @pytest.mark.integration 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_market_data_request_recovery(self, ezib_instance):
         """Test recovery from market data request errors."""
         logger.info("Starting market data request recovery test")
@@ -474,7 +485,7 @@ class TestPerformanceIntegration:
     """Test performance aspects in integration scenarios."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_bulk_contract_creation_performance(self, ezib_instance):
         """Test performance with bulk contract creation."""
         logger.info("Starting bulk contract creation performance test")
@@ -528,7 +539,7 @@ class TestPerformanceIntegration:
             raise
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_concurrent_operations(self, ezib_instance):
         """Test concurrent operations performance."""
         logger.info("Starting concurrent operations test")
@@ -577,7 +588,7 @@ class TestComprehensiveIntegration:
     """Comprehensive integration test combining all features."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_full_system_integration(self, ezib_instance):
         """Test full system integration with all major features."""
         logger.info("🚀 Starting comprehensive full system integration test")